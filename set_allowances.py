@@ -3,13 +3,69 @@ Script to set allowances for Polymarket trading.
 This approves USDC and CTF tokens for the Polymarket exchange contracts.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from web3 import Web3
 from web3.constants import MAX_INT
 from web3.middleware import ExtraDataToPOAMiddleware
 
 
+def _make_rpc_session() -> requests.Session:
+    """Keep-alive session so every RPC call reuses one TLS connection."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry))
+    return session
+
+
+class RpcPool:
+    """
+    Prioritized Polygon RPC endpoints with a simple circuit breaker.
+    A call that fails at the transport level demotes its endpoint for a
+    cool-down window and falls through to the next one, so a single RPC
+    going down or rate-limiting mid-run no longer aborts the script.
+    """
+
+    COOLDOWN_SECONDS = 30
+
+    def __init__(self, urls: list):
+        self._endpoints = []
+        for url in urls:
+            w3 = Web3(Web3.HTTPProvider(url, session=_make_rpc_session(), request_kwargs={'timeout': 10}))
+            w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+            self._endpoints.append({'url': url, 'web3': w3, 'demoted_until': 0.0})
+
+    def _healthy(self) -> list:
+        import time
+        now = time.monotonic()
+        pool = [e for e in self._endpoints if e['demoted_until'] <= now]
+        # If everything is cooling down, try the full list anyway
+        return pool or self._endpoints
+
+    def primary(self) -> Web3:
+        return self._healthy()[0]['web3']
+
+    def call(self, method: str, *args, **kwargs):
+        """Run an `eth` method (or property) against the first healthy endpoint."""
+        import time
+        last_error: Exception | None = None
+        for ep in self._healthy():
+            try:
+                attr = getattr(ep['web3'].eth, method)
+                return attr(*args, **kwargs) if callable(attr) else attr
+            except requests.RequestException as e:
+                print(f'   ⚠ RPC {ep["url"]} failed ({e.__class__.__name__}), trying next endpoint...')
+                ep['demoted_until'] = time.monotonic() + self.COOLDOWN_SECONDS
+                last_error = e
+                continue
+        raise last_error if last_error else Exception('No RPC endpoint available')
+
+
 def set_allowances():
     """Set allowances for USDC and CTF tokens to Polymarket contracts."""
     # Load .env from current directory or parent
@@ -26,25 +82,25 @@ def set_allowances():
         'https://polygon.llamarpc.com',  # LlamaNodes
     ]
     
-    rpc_url = None
-    web3 = None
-    
-    # Try to connect to available RPC
-    for url in rpc_urls:
+    pool = RpcPool(rpc_urls)
+
+    # Confirm at least one endpoint answers before doing anything else
+    connected = False
+    for ep in pool._endpoints:
         try:
-            print(f'Attempting to connect to {url}...')
-            test_web3 = Web3(Web3.HTTPProvider(url, request_kwargs={'timeout': 10}))
-            if test_web3.is_connected():
-                rpc_url = url
-                web3 = test_web3
-                print(f'✓ Connected to {url}\n')
+            print(f'Attempting to connect to {ep["url"]}...')
+            if ep['web3'].is_connected():
+                print(f'✓ Connected to {ep["url"]}\n')
+                connected = True
                 break
         except Exception as e:
             print(f'✗ Failed: {e}')
             continue
-    
-    if not web3:
+
+    if not connected:
         raise Exception('Could not connect to any Polygon RPC endpoint. Please check your internet connection.')
+
+    web3 = pool.primary()
     priv_key = os.getenv('PK')  # Polygon account private key (needs some MATIC)
     pub_key = os.getenv('PBK')  # Polygon account public key corresponding to private key
 
@@ -61,86 +117,74 @@ def set_allowances():
     usdc_address = '0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174'
     ctf_address = '0x4D97DCd97eC945f40cF65F87097ACe5EA0476045'
 
-    web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-
-    balance = web3.eth.get_balance(pub_key)
+    balance = pool.call('get_balance', pub_key)
 
     if balance == 0:
         raise Exception('No MATIC in your wallet. Please add some MATIC for gas fees.')
     
     print(f'Current MATIC balance: {web3.from_wei(balance, "ether")} MATIC')
 
-    nonce = web3.eth.get_transaction_count(pub_key)
+    # 'pending' accounts for any txs already in the mempool from this wallet,
+    # so the consecutive client-side nonces below never collide.
+    nonce = pool.call('get_transaction_count', pub_key, 'pending')
+    # One eth_gasPrice call for the whole batch, padded 10% so all six clear
+    gas_price = int(pool.call('gas_price') * 1.1)
 
     usdc = web3.eth.contract(address=usdc_address, abi=erc20_approve)
     ctf = web3.eth.contract(address=ctf_address, abi=erc1155_set_approval)
 
+    max_int = int(MAX_INT, 0)
+
+    # The six approvals, with calldata encoded locally up front: (description, to, data).
+    # An approve/setApprovalForAll comfortably fits in 100k gas, so a fixed limit
+    # also skips build_transaction's per-tx eth_estimateGas round-trip.
+    approvals = [
+        ('Approving USDC for CTF Exchange',
+         usdc_address, usdc.encode_abi('approve', args=['0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E', max_int])),
+        ('Approving CTF tokens for CTF Exchange',
+         ctf_address, ctf.encode_abi('setApprovalForAll', args=['0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E', True])),
+        ('Approving USDC for Neg Risk CTF Exchange',
+         usdc_address, usdc.encode_abi('approve', args=['0xC5d563A36AE78145C45a50134d48A1215220f80a', max_int])),
+        ('Approving CTF tokens for Neg Risk CTF Exchange',
+         ctf_address, ctf.encode_abi('setApprovalForAll', args=['0xC5d563A36AE78145C45a50134d48A1215220f80a', True])),
+        ('Approving USDC for Neg Risk Adapter',
+         usdc_address, usdc.encode_abi('approve', args=['0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296', max_int])),
+        ('Approving CTF tokens for Neg Risk Adapter',
+         ctf_address, ctf.encode_abi('setApprovalForAll', args=['0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296', True])),
+    ]
+
     print('\nSetting allowances for Polymarket contracts...\n')
 
-    # CTF Exchange
-    print('1. Approving USDC for CTF Exchange...')
-    raw_usdc_approve_txn = usdc.functions.approve('0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E', int(MAX_INT, 0)
-    ).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_usdc_approve_tx = web3.eth.account.sign_transaction(raw_usdc_approve_txn, private_key=priv_key)
-    send_usdc_approve_tx = web3.eth.send_raw_transaction(signed_usdc_approve_tx.raw_transaction)
-    usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(send_usdc_approve_tx, 600)
-    print(f'   ✓ Transaction: {usdc_approve_tx_receipt.transactionHash.hex()}')
-
-    # Wait a moment and get updated nonce
-    import time
-    time.sleep(2)
-    nonce = web3.eth.get_transaction_count(pub_key)
-
-    print('2. Approving CTF tokens for CTF Exchange...')
-    raw_ctf_approval_txn = ctf.functions.setApprovalForAll('0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E', True).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_ctf_approval_tx = web3.eth.account.sign_transaction(raw_ctf_approval_txn, private_key=priv_key)
-    send_ctf_approval_tx = web3.eth.send_raw_transaction(signed_ctf_approval_tx.raw_transaction)
-    ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(send_ctf_approval_tx, 600)
-    print(f'   ✓ Transaction: {ctf_approval_tx_receipt.transactionHash.hex()}')
-
-    time.sleep(2)
-    nonce = web3.eth.get_transaction_count(pub_key)
-
-    # Neg Risk CTF Exchange
-    print('3. Approving USDC for Neg Risk CTF Exchange...')
-    raw_usdc_approve_txn = usdc.functions.approve('0xC5d563A36AE78145C45a50134d48A1215220f80a', int(MAX_INT, 0)
-    ).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_usdc_approve_tx = web3.eth.account.sign_transaction(raw_usdc_approve_txn, private_key=priv_key)
-    send_usdc_approve_tx = web3.eth.send_raw_transaction(signed_usdc_approve_tx.raw_transaction)
-    usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(send_usdc_approve_tx, 600)
-    print(f'   ✓ Transaction: {usdc_approve_tx_receipt.transactionHash.hex()}')
-
-    time.sleep(2)
-    nonce = web3.eth.get_transaction_count(pub_key)
-
-    print('4. Approving CTF tokens for Neg Risk CTF Exchange...')
-    raw_ctf_approval_txn = ctf.functions.setApprovalForAll('0xC5d563A36AE78145C45a50134d48A1215220f80a', True).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_ctf_approval_tx = web3.eth.account.sign_transaction(raw_ctf_approval_txn, private_key=priv_key)
-    send_ctf_approval_tx = web3.eth.send_raw_transaction(signed_ctf_approval_tx.raw_transaction)
-    ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(send_ctf_approval_tx, 600)
-    print(f'   ✓ Transaction: {ctf_approval_tx_receipt.transactionHash.hex()}')
-
-    time.sleep(2)
-    nonce = web3.eth.get_transaction_count(pub_key)
-
-    # Neg Risk Adapter
-    print('5. Approving USDC for Neg Risk Adapter...')
-    raw_usdc_approve_txn = usdc.functions.approve('0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296', int(MAX_INT, 0)
-    ).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_usdc_approve_tx = web3.eth.account.sign_transaction(raw_usdc_approve_txn, private_key=priv_key)
-    send_usdc_approve_tx = web3.eth.send_raw_transaction(signed_usdc_approve_tx.raw_transaction)
-    usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(send_usdc_approve_tx, 600)
-    print(f'   ✓ Transaction: {usdc_approve_tx_receipt.transactionHash.hex()}')
-
-    time.sleep(2)
-    nonce = web3.eth.get_transaction_count(pub_key)
-
-    print('6. Approving CTF tokens for Neg Risk Adapter...')
-    raw_ctf_approval_txn = ctf.functions.setApprovalForAll('0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296', True).build_transaction({'chainId': chain_id, 'from': pub_key, 'nonce': nonce, 'gasPrice': web3.eth.gas_price})
-    signed_ctf_approval_tx = web3.eth.account.sign_transaction(raw_ctf_approval_txn, private_key=priv_key)
-    send_ctf_approval_tx = web3.eth.send_raw_transaction(signed_ctf_approval_tx.raw_transaction)
-    ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(send_ctf_approval_tx, 600)
-    print(f'   ✓ Transaction: {ctf_approval_tx_receipt.transactionHash.hex()}')
+    # Sign all six with consecutive nonces and broadcast back-to-back, so the
+    # whole batch lands in ~1 block instead of waiting for each receipt in turn.
+    tx_hashes = []
+    for i, (label, to_address, data) in enumerate(approvals):
+        print(f'{i + 1}. {label}...')
+        raw_txn = {
+            'chainId': chain_id,
+            'to': to_address,
+            'from': pub_key,
+            'nonce': nonce + i,
+            'gas': 100_000,
+            'gasPrice': gas_price,
+            'data': data,
+        }
+        signed_tx = web3.eth.account.sign_transaction(raw_txn, private_key=priv_key)
+        tx_hash = pool.call('send_raw_transaction', signed_tx.raw_transaction)
+        tx_hashes.append(tx_hash)
+        print(f'   → Broadcast: {tx_hash.hex()}')
+
+    print('\nWaiting for confirmations...\n')
+    with ThreadPoolExecutor(max_workers=len(tx_hashes)) as executor:
+        receipts = list(executor.map(
+            # Polygon blocks arrive ~every 2s; the default 0.1s poll just spams the RPC
+            lambda h: pool.call('wait_for_transaction_receipt', h, timeout=600, poll_latency=2),
+            tx_hashes,
+        ))
+
+    for i, ((label, _, _), receipt) in enumerate(zip(approvals, receipts)):
+        print(f'{i + 1}. {label}')
+        print(f'   ✓ Transaction: {receipt.transactionHash.hex()}')
 
     print('\n✅ All allowances set successfully!')
     print('Your wallet is now ready to place orders on Polymarket.')
@@ -1,10 +1,19 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from src.routes.api import api_router
+from src.services.polymarket_service import aclose_clients
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    await aclose_clients()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Polymarket Telegram Bot API", version="1.0.0")
+    app = FastAPI(title="Polymarket Telegram Bot API", version="1.0.0", lifespan=_lifespan)
     app.include_router(api_router, prefix="/api")
     return app
 
@@ -1,3 +1,4 @@
+import functools
 import os
 from dataclasses import dataclass
 from dotenv import load_dotenv
@@ -22,6 +23,9 @@ class Config:
     gamma_endpoint: str | None
 
 
+# Env vars never change during a process's lifetime, so parse .env once.
+# Use load_config.cache_clear() to force a re-read (e.g. in tests).
+@functools.lru_cache(maxsize=1)
 def load_config() -> Config:
     load_dotenv()
 
@@ -48,3 +52,10 @@ def load_config() -> Config:
     )
 
 
+def reload_config() -> Config:
+    """Drop the cached config and re-read the environment (for /reload-style
+    commands or tests); callers holding an old Config keep their snapshot."""
+    load_config.cache_clear()
+    return load_config()
+
+
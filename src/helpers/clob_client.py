@@ -1,4 +1,7 @@
 import os
+import threading
+from typing import Optional
+
 from dotenv import load_dotenv
 
 try:
@@ -7,13 +10,68 @@ except Exception:  # Backward compatibility for older versions
     from py_clob_client import ClobClient  # type: ignore
 
 
+# Building a client re-parses .env and hits the CLOB to derive API creds, so
+# cache one instance for the whole process instead of rebuilding per request.
+_client: Optional["ClobClient"] = None
+_client_lock = threading.Lock()
+
+
 def create_clob_client() -> "ClobClient":
     """
-    Build a ClobClient using env vars.
-    Required: HOST (CLOB endpoint), PK (private key)
+    Return the process-wide ClobClient, building it on first use.
+    Required env: HOST (CLOB endpoint), PK (private key)
     Optional: CLOB_API_KEY, CLOB_SECRET, CLOB_PASS_PHRASE
     """
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            _client = _build_clob_client()
+        return _client
+
+
+def reset_clob_client() -> None:
+    """Drop the cached client so the next call rebuilds it (mainly for tests)."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def _install_keepalive_session() -> None:
+    """Point py_clob_client's HTTP layer at one keep-alive Session.
+
+    The SDK's http_helpers module calls `requests.request(...)` (building a
+    fresh connection per call). A Session exposes the same request/get/post
+    surface, so rebinding the module references reuses one pooled connection
+    and advertises gzip. Guarded end-to-end: an SDK layout we don't
+    recognize just keeps its default behaviour.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from py_clob_client.http_helpers import helpers as _hh  # type: ignore
+    except Exception:
+        return
+    try:
+        session = requests.Session()
+        session.headers.update({"Accept-Encoding": "gzip"})
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if getattr(_hh, "requests", None) is requests:
+            _hh.requests = session  # type: ignore[assignment]
+        # Some versions import the verb functions directly
+        for name in ("request", "get", "post", "delete", "put"):
+            if getattr(_hh, name, None) is getattr(requests, name, None):
+                setattr(_hh, name, getattr(session, name))
+    except Exception:
+        pass
+
+
+def _build_clob_client() -> "ClobClient":
     load_dotenv()
+    _install_keepalive_session()
 
     host = os.getenv("HOST", "https://clob.polymarket.com")
     pk_env = os.getenv("PK")
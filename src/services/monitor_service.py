@@ -5,12 +5,31 @@ import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+import httpx
+
+from src.config.env import load_config
 from src.helpers.clob_client import create_clob_client
 from src.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+# Resolve the optional typed params once at import instead of on every
+# monitor session start
+try:
+    from py_clob_client.clob_types import TradeParams as _TradeParams, OpenOrderParams as _OpenOrderParams  # type: ignore
+except Exception:
+    _TradeParams = None  # type: ignore[assignment]
+    _OpenOrderParams = None  # type: ignore[assignment]
+
+# Shared client for the public CLOB price endpoints: one keep-alive
+# (HTTP/2-multiplexed when available) connection serves every monitor session
+# instead of the SDK opening a fresh blocking connection per call.
+try:
+    _HTTPX = httpx.AsyncClient(http2=True, limits=httpx.Limits(max_keepalive_connections=8), timeout=10)
+except ImportError:  # h2 extra not installed
+    _HTTPX = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=8), timeout=10)
+
 
 def _safe_len(obj: Any) -> int:
     try:
@@ -23,6 +42,76 @@ async def _to_thread(func, *args, **kwargs):
     return await asyncio.to_thread(func, *args, **kwargs)
 
 
+async def _fetch_price_field(path: str, params: Dict[str, Any], field: str) -> Optional[Any]:
+    """GET a public CLOB price endpoint over the shared client; None on failure."""
+    cfg = load_config()
+    try:
+        resp = await _HTTPX.get(f"{cfg.host.rstrip('/')}{path}", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        return data.get(field) if isinstance(data, dict) else data
+    except Exception as e:
+        logger.debug("CLOB HTTP price fetch failed (%s): %s", path, e)
+        return None
+
+
+async def _get_last_trade_price(client: Any, token_id: str) -> Any:
+    v = await _fetch_price_field("/last-trade-price", {"token_id": token_id}, "price")
+    return v if v is not None else await _to_thread(client.get_last_trade_price, token_id)
+
+
+async def _get_midpoint(client: Any, token_id: str) -> Any:
+    v = await _fetch_price_field("/midpoint", {"token_id": token_id}, "mid")
+    return v if v is not None else await _to_thread(client.get_midpoint, token_id)
+
+
+async def _get_best_buy(client: Any, token_id: str) -> Any:
+    v = await _fetch_price_field("/price", {"token_id": token_id, "side": "BUY"}, "price")
+    return v if v is not None else await _to_thread(client.get_price, token_id, "BUY")
+
+
+def _price_moved(current: Any, previous: Any, delta: float) -> bool:
+    """True when a price changed by more than `delta` (or became known/unknown)."""
+    try:
+        if current == previous:
+            return False
+        return abs(float(current) - float(previous)) > delta
+    except Exception:
+        # One side is "N/A"/None or unparsable; treat any change as movement
+        return current != previous
+
+
+# Candidate field names, hoisted so the per-trade loops don't rebuild the
+# tuples (and their getattr chains) on every row
+_TS_FIELDS = ("match_time", "timestamp")
+_SIDE_FIELDS = ("side",)
+_SIZE_FIELDS = ("size",)
+_PRICE_FIELDS = ("price",)
+
+
+def _t_field(t: Any, names: tuple) -> Optional[Any]:
+    """First non-None field among candidate names, dict or SDK object."""
+    if isinstance(t, dict):
+        for name in names:
+            v = t.get(name)
+            if v is not None:
+                return v
+        return None
+    for name in names:
+        v = getattr(t, name, None)
+        if v is not None:
+            return v
+    return None
+
+
+def _trade_ts(t: Any) -> Optional[Any]:
+    """Best-effort timestamp of a trade across SDK object/dict shapes."""
+    try:
+        return _t_field(t, _TS_FIELDS)
+    except Exception:
+        return None
+
+
 async def monitor_trades_and_orders(
     chat_id: int,
     bot,
@@ -31,22 +120,24 @@ async def monitor_trades_and_orders(
     token_id: Optional[str] = None,
     poll_interval_seconds: int = 10,
     duration_seconds: int = 300,
+    price_delta: float = 0.005,
+    summary_every_ticks: int = 6,
 ) -> None:
     """
     Periodically fetches trades, open orders and prices for a specific market/token
     and sends compact updates to the Telegram chat.
+
+    To stay under Telegram's per-chat rate limit, a tick only produces a message
+    when there are new trades or a price moved by more than `price_delta`;
+    otherwise a heartbeat summary goes out every `summary_every_ticks` ticks.
     """
-    client = create_clob_client()
+    # Building the client reads .env and may hit the CLOB to derive API creds;
+    # keep that off the shared event loop.
+    client = await asyncio.to_thread(create_clob_client)
 
-    # Import optional typed params if available
-    TradeParams = None  # type: ignore[assignment]
-    OpenOrderParams = None  # type: ignore[assignment]
-    try:
-        from py_clob_client.clob_types import TradeParams as _TP, OpenOrderParams as _OP  # type: ignore
-        TradeParams = _TP  # type: ignore[assignment]
-        OpenOrderParams = _OP  # type: ignore[assignment]
-    except Exception:
-        pass
+    # Local bindings of the module-level optional symbols
+    TradeParams = _TradeParams
+    OpenOrderParams = _OpenOrderParams
 
     address = None
     try:
@@ -54,7 +145,7 @@ async def monitor_trades_and_orders(
     except Exception:
         address = None
 
-    start_ts = time.time()
+    start_ts = time.monotonic()
     # Baseline trades count
     try:
         if TradeParams is not None:
@@ -65,63 +156,119 @@ async def monitor_trades_and_orders(
         baseline_trades = []
 
     baseline_count = _safe_len(baseline_trades)
+    # Cursor so each tick only downloads trades newer than what we've seen,
+    # instead of re-fetching (and re-parsing) the whole history every poll.
+    last_seen_ts = _trade_ts(baseline_trades[-1]) if baseline_count else None  # type: ignore[index]
 
     try:
         await bot.send_message(chat_id=chat_id, text=f"[{datetime.now()}] Monitoring started. Initial trades: {baseline_count}")
     except Exception:
         logger.warning("Failed to send monitoring start message to chat %s", chat_id)
 
-    while time.time() - start_ts < duration_seconds:
+    last_sent_text: Optional[str] = None
+    last_sent_last: Any = None
+    last_sent_mid: Any = None
+    ticks_since_send = 0
+
+    # Deadline-based schedule: ticks stay on a fixed cadence instead of
+    # drifting by (work time + sleep) whenever the CLOB is slow.
+    interval = max(2, poll_interval_seconds)
+    next_deadline = start_ts + interval
+
+    while time.monotonic() - start_ts < duration_seconds:
         try:
-            # Trades
+            # Fan out all reads for this tick concurrently; each one is an
+            # independent HTTP round-trip so the tick costs max(call) not sum(calls).
+            incremental = False
             if TradeParams is not None:
-                trades = await _to_thread(client.get_trades, TradeParams(market=condition_id, maker_address=address))
+                trade_params = None
+                if last_seen_ts is not None:
+                    try:
+                        trade_params = TradeParams(market=condition_id, maker_address=address, after=last_seen_ts)
+                        incremental = True
+                    except TypeError:
+                        trade_params = None
+                if trade_params is None:
+                    trade_params = TradeParams(market=condition_id, maker_address=address)
+                trades_coro = _to_thread(client.get_trades, trade_params)
             else:
-                trades = await _to_thread(client.get_trades)
-            total_trades = _safe_len(trades)
-            new_trades = max(0, total_trades - baseline_count)
+                trades_coro = _to_thread(client.get_trades)
+            if OpenOrderParams is not None:
+                orders_coro = _to_thread(client.get_orders, OpenOrderParams())
+            else:
+                orders_coro = _to_thread(client.get_orders)
 
-            # Open orders
-            try:
-                if OpenOrderParams is not None:
-                    open_orders = await _to_thread(client.get_orders, OpenOrderParams())
-                else:
-                    open_orders = await _to_thread(client.get_orders)
-                open_count = _safe_len(open_orders)
-            except Exception:
-                open_count = 0
+            coros = [trades_coro, orders_coro]
+            if token_id:
+                coros.extend([
+                    _get_last_trade_price(client, token_id),
+                    _get_midpoint(client, token_id),
+                    _get_best_buy(client, token_id),
+                ])
+            results = await asyncio.gather(*coros, return_exceptions=True)
+
+            trades = results[0] if not isinstance(results[0], Exception) else []
+            if incremental:
+                # Server already filtered to trades after the cursor
+                new_trades = _safe_len(trades)
+                total_trades = baseline_count + new_trades
+            else:
+                total_trades = _safe_len(trades)
+                new_trades = max(0, total_trades - baseline_count)
+            recent_trades = trades if incremental else (trades[-new_trades:] if new_trades else [])  # type: ignore[index]
+            baseline_count = total_trades
+            if new_trades and recent_trades:
+                ts = _trade_ts(recent_trades[-1])
+                if ts is not None:
+                    last_seen_ts = ts
+
+            open_count = _safe_len(results[1]) if not isinstance(results[1], Exception) else 0
 
-            # Prices
             last_price = midpoint = best_buy = "N/A"
-            try:
-                if token_id:
-                    last_price = await _to_thread(client.get_last_trade_price, token_id)
-                if token_id:
-                    midpoint = await _to_thread(client.get_midpoint, token_id)
-                if token_id:
-                    best_buy = await _to_thread(client.get_price, token_id, "BUY")
-            except Exception as e:
-                logger.debug("Price fetch error: %s", e)
+            if token_id:
+                for name, r in zip(("last_price", "midpoint", "best_buy"), results[2:]):
+                    if isinstance(r, Exception):
+                        logger.debug("Price fetch error (%s): %s", name, r)
+                    elif name == "last_price":
+                        last_price = r
+                    elif name == "midpoint":
+                        midpoint = r
+                    else:
+                        best_buy = r
 
             text = (
                 f"[{datetime.now()}] Trades: {total_trades} total (+{new_trades} new) | "
                 f"Open Orders: {open_count} | Last: ${last_price} | Mid: ${midpoint} | Best Buy: ${best_buy}"
             )
-            try:
-                await bot.send_message(chat_id=chat_id, text=text)
-            except Exception:
-                logger.warning("Failed to send monitoring tick to chat %s", chat_id)
+            # Coalesce: only message on real activity, price movement, or as a
+            # periodic heartbeat — most ticks report nothing new.
+            ticks_since_send += 1
+            should_send = (
+                new_trades > 0
+                or _price_moved(last_price, last_sent_last, price_delta)
+                or _price_moved(midpoint, last_sent_mid, price_delta)
+                or ticks_since_send >= summary_every_ticks
+            )
+            if should_send and text != last_sent_text:
+                try:
+                    await bot.send_message(chat_id=chat_id, text=text)
+                    last_sent_text = text
+                    last_sent_last = last_price
+                    last_sent_mid = midpoint
+                    ticks_since_send = 0
+                except Exception:
+                    logger.warning("Failed to send monitoring tick to chat %s", chat_id)
 
             # Optional: brief details on new trades
             if new_trades > 0:
                 try:
                     lines = ["New trades:"]
-                    for t in trades[-new_trades:]:  # type: ignore[index]
+                    for t in recent_trades:
                         try:
-                            side = getattr(t, "side", None) or t.get("side")  # type: ignore[union-attr]
-                            size = getattr(t, "size", None) or t.get("size")  # type: ignore[union-attr]
-                            price = getattr(t, "price", None) or t.get("price")  # type: ignore[union-attr]
-                            ts = getattr(t, "timestamp", None) or t.get("timestamp")  # type: ignore[union-attr]
+                            side = _t_field(t, _SIDE_FIELDS)
+                            size = _t_field(t, _SIZE_FIELDS)
+                            price = _t_field(t, _PRICE_FIELDS)
+                            ts = _t_field(t, _TS_FIELDS)
                             lines.append(f" • {side} {size} @ ${price} at {ts}")
                         except Exception:
                             continue
@@ -138,7 +285,11 @@ async def monitor_trades_and_orders(
             except Exception:
                 pass
 
-        await asyncio.sleep(max(2, poll_interval_seconds))
+        remaining = next_deadline - time.monotonic()
+        if remaining < 0:
+            logger.warning("Monitor tick for chat %s overran its %ss interval by %.1fs", chat_id, interval, -remaining)
+        next_deadline += interval
+        await asyncio.sleep(max(0, remaining))
 
     try:
         await bot.send_message(chat_id=chat_id, text=f"Monitoring ended after {duration_seconds}s.")
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import concurrent.futures
+import functools
+import random
+import re
+import time
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -13,52 +20,182 @@ from src.services.order_service import place_limit_order, get_market
 
 logger = get_logger(__name__)
 
+# Optional fast C ISO-8601 parser; stdlib fromisoformat otherwise
+try:
+    from ciso8601 import parse_datetime as _parse_dt  # type: ignore
+except Exception:
+    _parse_dt = datetime.fromisoformat
+
+# Optional Rust JSON parser — market/event payloads are large enough that
+# decode time shows up in scans; fall back to httpx's stdlib-based .json()
+try:
+    import orjson  # type: ignore
+
+    def _decode(resp: httpx.Response) -> Any:
+        return orjson.loads(resp.content)
+except Exception:
+    def _decode(resp: httpx.Response) -> Any:
+        return resp.json()
+
+# Optional NumPy for vectorizing the bulk price filter over large scans
+try:
+    import numpy as _np  # type: ignore
+except Exception:
+    _np = None  # type: ignore[assignment]
+
+# Matches e.g. "Size (1) lower than the minimum: 5" from CLOB order rejections
+_MIN_SIZE_RE = re.compile(r"minimum:\s*(\d+)")
+# 0x-prefixed hex string (condition ids are 64/66 chars total)
+_HEX_COND_RE = re.compile(r"^0x[0-9a-fA-F]+$")
+
+# Candidate price fields across token shapes, in preference order
+_PRICE_KEYS = ('price', 'lastPrice', 'last_price', 'bestOffer', 'best_offer')
+_PRICE_KEYS_WITH_BID = _PRICE_KEYS + ('bestBid',)
+
+
+# Base URLs never change at runtime (load_config is itself cached); keep the
+# rstrip'd forms out of the per-call hot path.
+@functools.cache
+def _clob_host() -> str:
+    return load_config().host.rstrip("/")
+
+
+@functools.cache
+def _gamma_base() -> str:
+    return (load_config().gamma_endpoint or "").rstrip("/")
+
+
+# Token-id resolution cache: the bot re-scans the same markets every cycle and
+# each resolution costs up to 3 Gamma round-trips. Cache results for a few
+# minutes and coalesce concurrent lookups for the same key into one request.
+_TOKEN_CACHE: Dict[tuple, tuple] = {}  # key -> (expires_at, token_id or None)
+_TOKEN_CACHE_TTL = 300.0
+# Failed lookups get a much shorter window: a market that was missing from
+# Gamma a minute ago may well resolve on the next listing refresh.
+_TOKEN_NEG_CACHE_TTL = 60.0
+_TOKEN_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+
+async def _cached_resolution(key: tuple, resolver) -> Optional[str]:
+    """Run `resolver()` at most once per key per TTL window."""
+    now = time.monotonic()
+    cached = _TOKEN_CACHE.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    inflight = _TOKEN_INFLIGHT.get(key)
+    if inflight is not None:
+        return await inflight
+    fut: asyncio.Future = asyncio.get_running_loop().create_future()
+    _TOKEN_INFLIGHT[key] = fut
+    try:
+        tid = await resolver()
+        _TOKEN_CACHE[key] = (now + (_TOKEN_CACHE_TTL if tid else _TOKEN_NEG_CACHE_TTL), tid)
+        fut.set_result(tid)
+        return tid
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        _TOKEN_INFLIGHT.pop(key, None)
+
+
+# Shared HTTP client: Gamma/CLOB calls are fired constantly while scanning, so
+# reuse one keep-alive connection pool instead of a TLS handshake per call.
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+        # HTTP/2 lets the gathered per-market requests multiplex over one TLS
+        # session; httpx already negotiates gzip (and brotli when installed)
+        # via Accept-Encoding, which matters on multi-KB market payloads.
+        # Transport-level retries cover connect failures (DNS blips, dropped
+        # keep-alive sockets) transparently, before our own backoff kicks in.
+        # Limits live on the transport since a custom transport bypasses the
+        # client-level pool settings.
+        try:
+            transport = httpx.AsyncHTTPTransport(retries=2, http2=True, limits=limits)
+        except ImportError:  # h2 extra not installed; keep-alive still applies
+            transport = httpx.AsyncHTTPTransport(retries=2, limits=limits)
+        _client = httpx.AsyncClient(timeout=20, transport=transport)
+    return _client
+
+
+async def aclose_clients() -> None:
+    """Close the shared HTTP client (call from the app shutdown hook)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def _normalize_market(m: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompute lowercased token outcomes once at fetch time; downstream
+    filters then do one dict lookup instead of str().strip().lower() per use."""
+    for t in m.get('tokens') or []:
+        if isinstance(t, dict):
+            t['_outcome_lc'] = str(t.get('outcome') or '').strip().lower()
+    return m
+
+
+def _outcome_lc(t: Any) -> str:
+    """Lowercased outcome of a token dict, memoized on the dict itself."""
+    if not isinstance(t, dict):
+        return ''
+    v = t.get('_outcome_lc')
+    if v is None:
+        v = str(t.get('outcome') or '').strip().lower()
+        t['_outcome_lc'] = v
+    return v
+
 
 async def fetch_markets(client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
-    cfg = load_config()
-    url = f"{cfg.host.rstrip('/')}/markets"
-    close_client = False
+    url = f"{_clob_host()}/markets"
     if client is None:
-        client = httpx.AsyncClient(timeout=20)
-        close_client = True
-    try:
-        resp = await client.get(url, params={"limit": 1000})
-        resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, dict) and "markets" in data:
-            return data["markets"]
-        if isinstance(data, list):
-            return data
-        return []
-    finally:
-        if close_client:
-            await client.aclose()
+        client = await get_client()
+    resp = await client.get(url, params={"limit": 1000})
+    resp.raise_for_status()
+    data = _decode(resp)
+    if isinstance(data, dict) and "markets" in data:
+        return [_normalize_market(m) for m in data["markets"]]
+    if isinstance(data, list):
+        return [_normalize_market(m) for m in data]
+    return []
 
 
 def _extract_no_opportunities(markets: List[Dict[str, Any]], max_price: float) -> List[Dict[str, Any]]:
-    opportunities: List[Dict[str, Any]] = []
+    # First pass gathers NO tokens with a usable price; the threshold compare
+    # then runs as one vectorized op when NumPy is around (thousands of
+    # markets per scan), with the plain comparison as fallback.
+    candidates: List[tuple] = []
+    prices: List[float] = []
     for m in markets:
         tokens = m.get('tokens') or []
         for t in tokens:
-            outcome = (t.get('outcome') or '').lower()
-            if outcome != 'no':
+            if _outcome_lc(t) != 'no':
                 continue
             # Try multiple possible price fields
-            price: Optional[float] = None
-            for key in ('price', 'lastPrice', 'last_price', 'bestOffer', 'best_offer'):
-                v = t.get(key)
-                if isinstance(v, (int, float)):
-                    price = float(v)
-                    break
+            price = next((float(v) for k in _PRICE_KEYS if isinstance((v := t.get(k)), (int, float))), None)
             if price is None:
                 continue
-            if price <= max_price:
-                opportunities.append({
-                    'market_question': m.get('question') or m.get('title') or 'Unknown',
-                    'condition_id': m.get('condition_id') or m.get('conditionId'),
-                    'token_id': t.get('token_id') or t.get('tokenId'),
-                    'price': price,
-                })
+            candidates.append((m, t))
+            prices.append(price)
+    if _np is not None and len(prices) > 64:
+        mask = _np.asarray(prices) <= max_price
+    else:
+        mask = [p <= max_price for p in prices]
+    opportunities: List[Dict[str, Any]] = []
+    for (m, t), price, keep in zip(candidates, prices, mask):
+        if not keep:
+            continue
+        opportunities.append({
+            'market_question': m.get('question') or m.get('title') or 'Unknown',
+            'condition_id': m.get('condition_id') or m.get('conditionId'),
+            'token_id': t.get('token_id') or t.get('tokenId'),
+            'price': price,
+        })
     return opportunities
 
 
@@ -69,56 +206,122 @@ async def scan_no_tokens(max_price: float) -> List[Dict[str, Any]]:
     return ops
 
 
+# Concurrent order-placement workers; sized well below CLOB rate limits
+_ORDER_WORKERS = 8
+
+# Dedicated pool for the blocking SDK order calls so a big batch neither
+# starves other to_thread users nor spawns an unbounded number of threads.
+_ORDER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='clob-order')
+atexit.register(_ORDER_EXECUTOR.shutdown, wait=True)
+
+
+async def _place_limit_order_async(token_id: str, side: str, price: float, size: int) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ORDER_EXECUTOR, place_limit_order, token_id, side, price, size)
+
+
+async def _place_one(op: Dict[str, Any], max_shares: int, max_price: float) -> Dict[str, Any]:
+    """Resolve, place and (if needed) min-size-retry a single opportunity."""
+    # One shallow copy up front; every exit path just updates it in place
+    # instead of re-spreading the opportunity dict per return.
+    op = dict(op)
+    token_id = op.get('token_id') or op.get('noTokenId')
+    if not token_id:
+        token_id = await _resolve_clob_no_token_id(op)
+    # If still no token id, skip placing to avoid 404s
+    if not token_id:
+        op.update(status='error', error='Missing token_id')
+        return op
+    price = min(float(op.get('price', max_price)), max_price)
+    try:
+        # Synchronously create and submit limit order via our order_service
+        resp = await _place_limit_order_async(token_id, 'BUY', price, int(max_shares))
+        order_id = None
+        if isinstance(resp, dict):
+            order_id = resp.get('order_id') or resp.get('id') or resp.get('orderId')
+        op.update(status='submitted', order_id=order_id, token_id=token_id, price=price, raw=resp)
+        return op
+    except Exception as e:  # Robust error handling per requirements
+        # If size too small error, parse minimum and retry once with that size
+        try:
+            msg = str(getattr(e, 'error_message', None) or getattr(e, 'args', [''])[0])
+            # examples: "Size (1) lower than the minimum: 5"
+            m = _MIN_SIZE_RE.search(msg)
+            if m:
+                min_required = int(m.group(1))
+                if min_required > int(max_shares):
+                    try:
+                        resp2 = await _place_limit_order_async(token_id, 'BUY', price, int(min_required))
+                        order_id2 = None
+                        if isinstance(resp2, dict):
+                            order_id2 = resp2.get('order_id') or resp2.get('id') or resp2.get('orderId')
+                        op.update(status='submitted', order_id=order_id2, token_id=token_id, price=price, raw=resp2, retryWithMin=min_required)
+                        return op
+                    except Exception as e_retry:
+                        op.update(status='error', error=f'retry_failed_min_size_{min_required}: {e_retry}')
+                        return op
+        except Exception:
+            pass
+        logger.exception("Order placement failed for %s: %s", token_id, e)
+        op.update(status='error', error=str(e))
+        return op
+
+
+async def _order_worker(q: asyncio.Queue, results: List[Dict[str, Any]], max_shares: int, max_price: float) -> None:
+    while True:
+        op = await q.get()
+        try:
+            if op is None:  # sentinel: no more work
+                return
+            results.append(await _place_one(op, max_shares, max_price))
+        finally:
+            q.task_done()
+
+
 async def place_buy_orders(opportunities: List[Dict[str, Any]], max_shares: int, max_price: float) -> List[Dict[str, Any]]:
+    # Producer/consumer: workers place orders concurrently instead of awaiting
+    # each opportunity one at a time. Result order is not guaranteed.
     results: List[Dict[str, Any]] = []
+    q: asyncio.Queue = asyncio.Queue()
+    workers = [
+        asyncio.create_task(_order_worker(q, results, max_shares, max_price))
+        for _ in range(min(_ORDER_WORKERS, max(1, len(opportunities))))
+    ]
     for op in opportunities:
-        token_id = op.get('token_id') or op.get('noTokenId')
-        if not token_id:
-            token_id = await _resolve_clob_no_token_id(op)
-        # If still no token id, skip placing to avoid 404s
-        if not token_id:
-            results.append({**op, 'status': 'error', 'error': 'Missing token_id'})
-            continue
-        price = min(float(op.get('price', max_price)), max_price)
-        try:
-            # Synchronously create and submit limit order via our order_service
-            resp = await asyncio.to_thread(place_limit_order, token_id, 'BUY', price, int(max_shares))
-            order_id = None
-            if isinstance(resp, dict):
-                order_id = resp.get('order_id') or resp.get('id') or resp.get('orderId')
-            results.append({**op, 'status': 'submitted', 'order_id': order_id, 'token_id': token_id, 'price': price, 'raw': resp})
-        except Exception as e:  # Robust error handling per requirements
-            # If size too small error, parse minimum and retry once with that size
-            try:
-                msg = str(getattr(e, 'error_message', None) or getattr(e, 'args', [''])[0])
-                # examples: "Size (1) lower than the minimum: 5"
-                import re
-                m = re.search(r"minimum:\s*(\d+)", msg)
-                if m:
-                    min_required = int(m.group(1))
-                    if min_required > int(max_shares):
-                        try:
-                            resp2 = await asyncio.to_thread(place_limit_order, token_id, 'BUY', price, int(min_required))
-                            order_id2 = None
-                            if isinstance(resp2, dict):
-                                order_id2 = resp2.get('order_id') or resp2.get('id') or resp2.get('orderId')
-                            results.append({**op, 'status': 'submitted', 'order_id': order_id2, 'token_id': token_id, 'price': price, 'raw': resp2, 'retryWithMin': min_required})
-                            continue
-                        except Exception as e_retry:
-                            results.append({**op, 'status': 'error', 'error': f'retry_failed_min_size_{min_required}: {e_retry}'})
-                            continue
-            except Exception:
-                pass
-            logger.exception("Order placement failed for %s: %s", token_id, e)
-            results.append({**op, 'status': 'error', 'error': str(e)})
+        q.put_nowait(op)
+    for _ in workers:
+        q.put_nowait(None)
+    await asyncio.gather(*workers)
     return results
 
 
 # ---------------------- Gamma Public Search Utilities ----------------------
 
+# Single-flight registry: overlapping scans (multiple chats scanning at once)
+# share one in-flight request per (query, page, limit) instead of duplicating it.
+_SEARCH_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+
 async def fetch_public_search_page(query: str = "*", page: int = 1, limit_per_type: int = 100) -> Dict[str, Any]:
-    cfg = load_config()
-    url = f"{(cfg.gamma_endpoint or '').rstrip('/')}/public-search"
+    key = (query, page, limit_per_type)
+    inflight = _SEARCH_INFLIGHT.get(key)
+    if inflight is not None:
+        return await inflight
+    fut: asyncio.Future = asyncio.get_running_loop().create_future()
+    _SEARCH_INFLIGHT[key] = fut
+    try:
+        result = await _fetch_public_search_page_uncoalesced(query, page, limit_per_type)
+        fut.set_result(result)
+        return result
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        _SEARCH_INFLIGHT.pop(key, None)
+
+
+async def _fetch_public_search_page_uncoalesced(query: str, page: int, limit_per_type: int) -> Dict[str, Any]:
+    url = f"{_gamma_base()}/public-search"
     params = {
         "q": query,
         "page": page,
@@ -127,42 +330,73 @@ async def fetch_public_search_page(query: str = "*", page: int = 1, limit_per_ty
         "ascending": False,
         "optimized": True,
     }
-    attempts = [10, 20, 30]
-    for timeout in attempts:
+    client = await get_client()
+    # Short jittered backoff between attempts: transient Gamma hiccups clear in
+    # well under a second, so retrying immediately (or with ever-longer
+    # timeouts) just burns wall-clock on a page that will succeed anyway.
+    for attempt, delay in enumerate((0, 0.5, 1.5)):
+        if delay:
+            await asyncio.sleep(delay + random.random() * 0.25)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                res = await client.get(url, params=params)
-                res.raise_for_status()
-                data = res.json()
-                events = data.get("events") or []
-                markets: List[Dict[str, Any]] = []
-                for ev in events:
-                    for mk in ev.get("markets") or []:
-                        mk["eventSlug"] = ev.get("slug")
-                        markets.append(mk)
-                has_more = bool(((data.get("pagination") or {}).get("hasMore")))
-                return {"markets": markets, "has_more": has_more}
+            res = await client.get(url, params=params, timeout=15)
+            res.raise_for_status()
+            data = _decode(res)
+            events = data.get("events") or []
+            markets: List[Dict[str, Any]] = []
+            for ev in events:
+                for mk in ev.get("markets") or []:
+                    mk["eventSlug"] = ev.get("slug")
+                    markets.append(_normalize_market(mk))
+            has_more = bool(((data.get("pagination") or {}).get("hasMore")))
+            return {"markets": markets, "has_more": has_more}
+        except (httpx.TimeoutException, httpx.HTTPStatusError) as e:
+            logger.warning("Gamma public-search attempt %d failed: %s", attempt + 1, e)
+            continue
         except Exception as e:
-            logger.warning("Gamma public-search attempt with timeout %ss failed: %s", timeout, e)
+            logger.warning("Gamma public-search attempt %d failed unexpectedly: %s", attempt + 1, e)
             continue
     logger.error("Gamma public-search failed after retries")
     return {"markets": [], "has_more": False}
 
 
-async def fetch_all_markets_public_search(query: str = "*", page_limit: int = 100, max_pages: int = 50) -> List[Dict[str, Any]]:
-    all_markets: List[Dict[str, Any]] = []
+async def iter_public_search_pages(query: str = "*", page_limit: int = 100, max_pages: int = 50):
+    """
+    Yield pages of markets with a one-page lookahead: the next page is already
+    in flight while the caller processes the current one, so total wall-clock
+    approaches max(fetch, processing) instead of their sum.
+    """
     page = 1
-    has_more = True
-    while has_more and page <= max_pages:
-        r = await fetch_public_search_page(query=query, page=page, limit_per_type=page_limit)
-        all_markets.extend(r["markets"]) if r else None
-        has_more = bool(r.get("has_more")) if r else False
+    next_task = asyncio.create_task(fetch_public_search_page(query=query, page=page, limit_per_type=page_limit))
+    while next_task is not None:
+        r = await next_task
+        markets = (r or {}).get("markets") or []
+        has_more = bool((r or {}).get("has_more"))
         page += 1
+        if has_more and page <= max_pages:
+            next_task = asyncio.create_task(fetch_public_search_page(query=query, page=page, limit_per_type=page_limit))
+        else:
+            next_task = None
+        yield markets
+
+
+async def fetch_all_markets_public_search(query: str = "*", page_limit: int = 100, max_pages: int = 50) -> List[Dict[str, Any]]:
+    all_markets: List[Dict[str, Any]] = []
+    # Gamma pages can overlap when listings shift between requests; dedupe so
+    # downstream filtering/resolution never processes the same market twice.
+    seen: set = set()
+    async for markets in iter_public_search_pages(query=query, page_limit=page_limit, max_pages=max_pages):
+        for m in markets:
+            key = m.get('id') or m.get('conditionId') or m.get('slug')
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            all_markets.append(m)
     logger.info("Gamma public-search fetched markets: %d", len(all_markets))
     return all_markets
 
 
-def _is_active_market(m: Dict[str, Any]) -> bool:
+def _is_active_market(m: Dict[str, Any], now: Optional[datetime] = None) -> bool:
     if not m:
         return False
     if m.get("active") is False:
@@ -175,130 +409,139 @@ def _is_active_market(m: Dict[str, Any]) -> bool:
         return False
     end_raw = m.get("endDate") or m.get("endDateIso")
     if end_raw:
+        end_str = str(end_raw).strip()
+        if end_str.endswith("Z"):
+            end_str = end_str[:-1] + "+00:00"
         try:
-            from datetime import datetime, timezone
-            end_str = str(end_raw).strip()
-            # Try ISO format parsing
-            try:
-                if end_str.endswith("Z"):
-                    end_str = end_str[:-1] + "+00:00"
-                elif "+" not in end_str and "-" in end_str:
-                    # Add UTC timezone if missing
-                    end_str = end_str + "+00:00"
-                end = datetime.fromisoformat(end_str)
-            except Exception:
-                # If parsing fails, try simple format
-                try:
-                    end = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-                except Exception:
-                    return True  # Can't parse, assume active
-            # Compare with current time
-            now = datetime.now(end.tzinfo) if end.tzinfo else datetime.now(timezone.utc)
-            if end.tzinfo and not now.tzinfo:
-                now = now.replace(tzinfo=timezone.utc)
-            elif now.tzinfo and not end.tzinfo:
-                end = end.replace(tzinfo=timezone.utc)
-            if end < now:
-                return False
+            end = _parse_dt(end_str)
         except Exception:
-            # If date parsing fails, assume market is active
-            pass
+            return True  # Can't parse, assume active
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        # Callers scanning many markets pass `now` once instead of per market
+        if now is None:
+            now = datetime.now(timezone.utc)
+        if end < now:
+            return False
     return True
 
 
+def _index_outcomes(outcomes: List[Any]) -> Dict[str, tuple]:
+    """One pass over outcomes (strings or dicts) -> {lowercased name: (index, outcome)}."""
+    return {
+        str((o.get('name') if isinstance(o, dict) else o) or '').strip().lower(): (i, o)
+        for i, o in enumerate(outcomes)
+    }
+
+
 def _derive_no_bid(m: Dict[str, Any]) -> Optional[float]:
     try:
+        # Bail before touching outcomes when the market carries no price data
+        raw_bid = m.get("bestBid")
+        raw_ask = m.get("bestAsk")
+        if raw_bid is None and raw_ask is None and not m.get("outcomePrices"):
+            return None
         outcomes = m.get("outcomes") or []
-        best_bid = float(m.get("bestBid")) if m.get("bestBid") is not None else None
-        best_ask = float(m.get("bestAsk")) if m.get("bestAsk") is not None else None
-        if best_bid is not None and best_ask is not None and outcomes:
-            first = str(outcomes[0] or "").strip().lower()
-            if first == "yes":
+        idx = _index_outcomes(outcomes)
+        best_bid = float(raw_bid) if raw_bid is not None else None
+        best_ask = float(raw_ask) if raw_ask is not None else None
+        if best_bid is not None and best_ask is not None and idx:
+            if idx.get("yes", (-1, None))[0] == 0:
                 # no bid ~ 1 - bestAsk
-                return (1 - best_ask) if best_ask is not None else None
-            if first == "no":
+                return 1 - best_ask
+            if idx.get("no", (-1, None))[0] == 0:
                 return best_bid
         # fallback to outcomePrices
         prices = m.get("outcomePrices") or []
-        idx = next((i for i, o in enumerate(outcomes) if str(o or "").strip().lower() == "no"), None)
-        if idx is not None and idx < len(prices):
-            p = float(prices[idx])
+        no_entry = idx.get("no")
+        if no_entry is not None and no_entry[0] < len(prices):
+            p = float(prices[no_entry[0]])
             return p if p >= 0 else None
     except Exception:
         return None
     return None
 
 
-def analyze_market_no(m: Dict[str, Any], max_price: float) -> Optional[Dict[str, Any]]:
-    if not _is_active_market(m):
-        return None
+def analyze_market_no(m: Dict[str, Any], max_price: float, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    # Price check first: a couple of dict lookups and a float compare rule out
+    # the vast majority of markets before the end-date parse ever runs.
     no_price = _derive_no_bid(m)
-    if no_price is None or no_price <= 0:
+    if no_price is None or no_price <= 0 or no_price > max_price:
         return None
-    if no_price <= max_price:
-        market_id = m.get("id") or m.get("market_id") or m.get("condition_id") or m.get("conditionId") or m.get("slug")
-        return {
-            "marketId": market_id,
-            "question": m.get("question"),
-            "noPrice": no_price,
-            "volume24h": m.get("volume") or m.get("volume_24h") or m.get("volumeNum") or 0,
-            "url": f"https://polymarket.com/event/{m.get('slug')}" if m.get("slug") else None,
-            "eventSlug": m.get("eventSlug"),
-        }
-    return None
+    if not _is_active_market(m, now):
+        return None
+    market_id = m.get("id") or m.get("market_id") or m.get("condition_id") or m.get("conditionId") or m.get("slug")
+    return {
+        "marketId": market_id,
+        "question": m.get("question"),
+        "noPrice": no_price,
+        "volume24h": m.get("volume") or m.get("volume_24h") or m.get("volumeNum") or 0,
+        "url": f"https://polymarket.com/event/{m.get('slug')}" if m.get("slug") else None,
+        "eventSlug": m.get("eventSlug"),
+    }
 
 
 async def resolve_no_token_id(market: Dict[str, Any]) -> Optional[str]:
-    cfg = load_config()
-    base = (cfg.gamma_endpoint or "").rstrip("/")
+    key = (
+        market.get("eventSlug") or market.get("event_slug"),
+        market.get("slug"),
+        market.get("condition_id") or market.get("conditionId"),
+    )
+    if key == (None, None, None):
+        return None
+    return await _cached_resolution(key, lambda: _resolve_no_token_id_uncached(market))
+
+
+async def _resolve_no_token_id_uncached(market: Dict[str, Any]) -> Optional[str]:
+    base = _gamma_base()
     if not base:
         return None
     get_id = lambda t: (t.get("token_id") or t.get("asset_id") or t.get("tokenId") or t.get("id")) if isinstance(t, dict) else None
-    async with httpx.AsyncClient(timeout=20) as client:
-        # event slug path
-        ev_slug = market.get("eventSlug") or market.get("event_slug")
-        if ev_slug:
-            try:
-                r = await client.get(f"{base}/events/slug/{ev_slug}")
-                data = r.json()
-                for mk in data.get("markets") or []:
-                    for t in mk.get("tokens") or []:
-                        if str(t.get("outcome")).upper() == "NO":
-                            tid = get_id(t)
-                            if tid:
-                                return str(tid)
-            except Exception:
-                pass
-        # market slug
-        slug = market.get("slug")
-        if slug:
-            try:
-                r = await client.get(f"{base}/markets/slug/{slug}")
-                data = r.json()
-                arr = data if isinstance(data, list) else [data] if data else []
-                for mk in arr:
-                    for t in mk.get("tokens") or []:
-                        if str(t.get("outcome")).upper() == "NO":
-                            tid = get_id(t)
-                            if tid:
-                                return str(tid)
-            except Exception:
-                pass
-        # by condition id
-        cond = market.get("condition_id") or market.get("conditionId")
-        if cond:
-            try:
-                r = await client.get(f"{base}/markets", params={"condition_id": cond, "closed": False, "limit": 5})
-                data = r.json()
-                arr = data if isinstance(data, list) else [data] if data else []
-                for mk in arr:
-                    for t in mk.get("tokens") or []:
-                        if str(t.get("outcome")).upper() == "NO":
-                            tid = get_id(t)
-                            if tid:
-                                return str(tid)
-            except Exception:
-                pass
+    client = await get_client()
+    # event slug path
+    ev_slug = market.get("eventSlug") or market.get("event_slug")
+    if ev_slug:
+        try:
+            r = await client.get(f"{base}/events/slug/{ev_slug}")
+            data = _decode(r)
+            for mk in data.get("markets") or []:
+                for t in mk.get("tokens") or []:
+                    if _outcome_lc(t) == "no":
+                        tid = get_id(t)
+                        if tid:
+                            return str(tid)
+        except Exception:
+            pass
+    # market slug
+    slug = market.get("slug")
+    if slug:
+        try:
+            r = await client.get(f"{base}/markets/slug/{slug}")
+            data = _decode(r)
+            arr = data if isinstance(data, list) else [data] if data else []
+            for mk in arr:
+                for t in mk.get("tokens") or []:
+                    if _outcome_lc(t) == "no":
+                        tid = get_id(t)
+                        if tid:
+                            return str(tid)
+        except Exception:
+            pass
+    # by condition id
+    cond = market.get("condition_id") or market.get("conditionId")
+    if cond:
+        try:
+            r = await client.get(f"{base}/markets", params={"condition_id": cond, "closed": False, "limit": 5})
+            data = _decode(r)
+            arr = data if isinstance(data, list) else [data] if data else []
+            for mk in arr:
+                for t in mk.get("tokens") or []:
+                    if _outcome_lc(t) == "no":
+                        tid = get_id(t)
+                        if tid:
+                            return str(tid)
+        except Exception:
+            pass
     return None
 
 
@@ -315,19 +558,29 @@ async def find_eligible_markets(max_price: float) -> List[Dict[str, Any]]:
     markets = await fetch_all_markets_public_search()
     if markets:
         logger.info("Processing %d markets from Gamma API...", len(markets))
+        # Filter first (pure CPU), then resolve token ids concurrently —
+        # the resolutions are independent HTTP calls, so cap them with a
+        # semaphore rather than awaiting one market at a time.
+        now = datetime.now(timezone.utc)
+        filtered: List[tuple] = []
         for m in markets:
-            opp = analyze_market_no(m, max_price)
-            if not opp:
-                continue
-            try:
-                tid = await resolve_no_token_id(m)
-                if tid:
-                    opp["noTokenId"] = tid
-                # Preserve market slug if available for later resolution
-                if m.get("slug"):
-                    opp["slug"] = m.get("slug")
-            except Exception:
-                pass
+            opp = analyze_market_no(m, max_price, now)
+            if opp:
+                filtered.append((m, opp))
+
+        sem = asyncio.Semaphore(20)
+
+        async def _resolve(m: Dict[str, Any]) -> Optional[str]:
+            async with sem:
+                return await resolve_no_token_id(m)
+
+        tids = await asyncio.gather(*(_resolve(m) for m, _ in filtered), return_exceptions=True)
+        for (m, opp), tid in zip(filtered, tids):
+            if isinstance(tid, str) and tid:
+                opp["noTokenId"] = tid
+            # Preserve market slug if available for later resolution
+            if m.get("slug"):
+                opp["slug"] = m.get("slug")
             eligible.append(opp)
         if eligible:
             logger.info("Eligible markets (Gamma): %d (NO <= %.4f)", len(eligible), max_price)
@@ -338,6 +591,10 @@ async def find_eligible_markets(max_price: float) -> List[Dict[str, Any]]:
     try:
         clob_markets = await fetch_markets()
         logger.info("Processing %d markets from CLOB API...", len(clob_markets))
+        # Phase 1 (pure CPU): filter and price every market first. Token-id
+        # resolution is HTTP, so it only runs afterwards, for markets that
+        # actually passed the price threshold.
+        unresolved: List[tuple] = []  # (market, entry) pairs still missing a token id
         for m in clob_markets:
             # Basic activity checks (best effort)
             if m.get('closed') is True or m.get('archived') is True:
@@ -354,22 +611,24 @@ async def find_eligible_markets(max_price: float) -> List[Dict[str, Any]]:
 
             # Case 1: tokens array present (older/newer CLOB shapes)
             if tokens:
-                no_token = next((t for t in tokens if str(t.get('outcome', '')).lower() == 'no'), None)
+                no_token = next((t for t in tokens if _outcome_lc(t) == 'no'), None)
                 if not no_token:
                     continue
-                for key in ('price', 'lastPrice', 'last_price', 'bestOffer', 'best_offer', 'bestBid'):
-                    v = no_token.get(key)
-                    if isinstance(v, (int, float)) and v > 0:
-                        price = float(v)
-                        break
+                price = next(
+                    (float(v) for k in _PRICE_KEYS_WITH_BID if isinstance((v := no_token.get(k)), (int, float)) and v > 0),
+                    None,
+                )
                 token_id = no_token.get('token_id') or no_token.get('tokenId')
 
             # Case 2: outcomes array present (like user's Node script)
             elif outcomes:
                 # Outcome objects can look like { name: 'No', bestBid: '0.01', bestAsk: '0.99' }
                 # Try to compute NO bid directly
-                no_outcome = next((o for o in outcomes if str(o.get('name', '')).lower() == 'no'), None)
-                yes_is_first = outcomes and str(outcomes[0].get('name', '')).lower() == 'yes'
+                outcome_idx = _index_outcomes(outcomes)
+                no_entry = outcome_idx.get('no')
+                no_outcome = no_entry[1] if no_entry else None
+                yes_entry = outcome_idx.get('yes')
+                yes_is_first = bool(yes_entry and yes_entry[0] == 0)
                 try:
                     best_bid = float((no_outcome or {}).get('bestBid') or 0)
                 except Exception:
@@ -390,27 +649,35 @@ async def find_eligible_markets(max_price: float) -> List[Dict[str, Any]]:
                     except Exception:
                         pass
 
-                # Token IDs are not present here; try to resolve via Gamma if available
-                try:
-                    resolved_tid = await resolve_no_token_id(m)
-                    if resolved_tid:
-                        token_id = resolved_tid
-                except Exception:
-                    pass
-
             # Keep only valid price and threshold
             if price is None or price <= 0 or price > max_price:
                 continue
 
-            eligible.append({
+            entry = {
                 'marketId': market_id,
                 'question': question,
                 'noPrice': price,
                 'noTokenId': token_id,  # may be None for alert-only
                 'volume24h': m.get('volume') or 0,
                 'url': None,
-            })
-        
+            }
+            eligible.append(entry)
+            if not token_id:
+                unresolved.append((m, entry))
+
+        # Phase 2 (HTTP): resolve missing token ids via Gamma, concurrently
+        if unresolved:
+            sem = asyncio.Semaphore(20)
+
+            async def _resolve(m: Dict[str, Any]) -> Optional[str]:
+                async with sem:
+                    return await resolve_no_token_id(m)
+
+            tids = await asyncio.gather(*(_resolve(m) for m, _ in unresolved), return_exceptions=True)
+            for (m, entry), tid in zip(unresolved, tids):
+                if isinstance(tid, str) and tid:
+                    entry['noTokenId'] = tid
+
         if eligible:
             logger.info("Eligible markets (CLOB fallback): %d (NO <= %.4f)", len(eligible), max_price)
         else:
@@ -433,53 +700,79 @@ async def cancel_order(order_id: str) -> Dict[str, Any]:
 
 # ---------------------- Token ID resolution for CLOB before placing ----------------------
 async def _resolve_clob_no_token_id(op: Dict[str, Any]) -> Optional[str]:
+    key = (op.get('eventSlug'), op.get('slug'), op.get('condition_id') or op.get('marketId'))
+    if key == (None, None, None):
+        return None
+    return await _cached_resolution(key, lambda: _resolve_clob_no_token_id_uncached(op))
+
+
+def _no_token_from_market(condition: Any) -> Optional[str]:
+    """CLOB lookup of a market's NO token id by condition id."""
+    m = get_market(condition)
+    tokens = m.get('tokens') or []
+    no_t = next((t for t in tokens if _outcome_lc(t) == 'no'), None)
+    if no_t:
+        return no_t.get('token_id') or no_t.get('tokenId')
+    return None
+
+
+async def _resolve_by_condition(op: Dict[str, Any]) -> Optional[str]:
     condition = op.get('condition_id') or op.get('marketId')
-    if isinstance(condition, str) and condition.startswith('0x') and len(condition) in (64, 66):
-        try:
-            m = get_market(condition)
-            tokens = m.get('tokens') or []
-            no_t = next((t for t in tokens if str(t.get('outcome','')).lower() == 'no'), None)
-            if no_t:
-                return no_t.get('token_id') or no_t.get('tokenId')
-        except Exception:
-            pass
-    cfg = load_config()
-    base = (cfg.gamma_endpoint or '').rstrip('/')
-    # Prefer explicit market slug if available
+    if isinstance(condition, str) and _HEX_COND_RE.match(condition) and len(condition) in (64, 66):
+        return _no_token_from_market(condition)
+    return None
+
+
+async def _resolve_by_slug(op: Dict[str, Any]) -> Optional[str]:
+    base = _gamma_base()
     slug = op.get('slug') or op.get('marketId')
-    event_slug = op.get('eventSlug')
-    if base and isinstance(slug, str) and slug:
+    if not (base and isinstance(slug, str) and slug):
+        return None
+    client = await get_client()
+    r = await client.get(f"{base}/markets/slug/{slug}")
+    data = _decode(r)
+    arr = data if isinstance(data, list) else [data] if data else []
+    for mk in arr:
+        cond = mk.get('condition_id') or mk.get('conditionId')
+        if not cond:
+            continue
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                r = await client.get(f"{base}/markets/slug/{slug}")
-                data = r.json()
-                arr = data if isinstance(data, list) else [data] if data else []
-                for mk in arr:
-                    cond = mk.get('condition_id') or mk.get('conditionId')
-                    if not cond:
-                        continue
-                    try:
-                        m = get_market(cond)
-                        tokens = m.get('tokens') or []
-                        no_t = next((t for t in tokens if str(t.get('outcome','')).lower() == 'no'), None)
-                        if no_t:
-                            return no_t.get('token_id') or no_t.get('tokenId')
-                    except Exception:
-                        continue
+            tid = _no_token_from_market(cond)
+            if tid:
+                return tid
         except Exception:
-            pass
-    # Try resolving via event slug if provided
-    if base and isinstance(event_slug, str) and event_slug:
+            continue
+    return None
+
+
+async def _resolve_by_event_slug(op: Dict[str, Any]) -> Optional[str]:
+    base = _gamma_base()
+    event_slug = op.get('eventSlug')
+    if not (base and isinstance(event_slug, str) and event_slug):
+        return None
+    client = await get_client()
+    r = await client.get(f"{base}/events/slug/{event_slug}")
+    data = _decode(r)
+    for mk in (data.get('markets') or []):
+        for t in mk.get('tokens') or []:
+            if _outcome_lc(t) == 'no':
+                tid = t.get('token_id') or t.get('tokenId') or t.get('id')
+                if tid:
+                    return str(tid)
+    return None
+
+
+# Ordered cheapest-first: the direct CLOB hit is one round-trip, the slug
+# strategies each need a Gamma call plus per-market CLOB lookups.
+_CLOB_RESOLUTION_STRATEGIES = (_resolve_by_condition, _resolve_by_slug, _resolve_by_event_slug)
+
+
+async def _resolve_clob_no_token_id_uncached(op: Dict[str, Any]) -> Optional[str]:
+    for strategy in _CLOB_RESOLUTION_STRATEGIES:
         try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                r = await client.get(f"{base}/events/slug/{event_slug}")
-                data = r.json()
-                for mk in (data.get('markets') or []):
-                    for t in mk.get('tokens') or []:
-                        if str(t.get('outcome')).upper() == 'NO':
-                            tid = t.get('token_id') or t.get('tokenId') or t.get('id')
-                            if tid:
-                                return str(tid)
+            tid = await strategy(op)
         except Exception:
-            pass
+            tid = None
+        if tid:
+            return tid
     return None
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any, Dict, List, Optional
+import time
+import operator
+from collections import defaultdict, deque
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from telegram import Update
 from telegram.constants import ParseMode
@@ -33,9 +36,28 @@ logger = get_logger(__name__)
 state: Dict[str, Any] = {
     'last_found': [],
 }
-scanning_tasks: Dict[int, asyncio.Task] = {}
+# chat_id -> (task, stop_event); the event gives /stop immediate effect
+# instead of waiting out the current sleep interval
+scanning_tasks: Dict[int, tuple] = {}
 monitor_tasks: Dict[int, asyncio.Task] = {}
 
+# Per-chat locks so two rapid /scan (or /monitor) invocations can't both
+# pass the "already running?" check and spawn duplicate loops
+_scan_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+_monitor_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# The event loop only keeps weak references to tasks, so anything spawned
+# fire-and-forget must be anchored here or it can be garbage-collected
+# mid-await. All background spawns in this module go through _spawn.
+_BG: set = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _BG.add(task)
+    task.add_done_callback(_BG.discard)
+    return task
+
 
 def _format_ops(ops: List[Dict[str, Any]]) -> str:
     if not ops:
@@ -51,7 +73,41 @@ def _format_ops(ops: List[Dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
+# Telegram caps bots at ~30 messages/s globally and ~1 message/s per chat.
+# Pace sends below those limits so bursty scans never trigger RetryAfter
+# cascades; a simple moving window under one lock is enough at bot scale.
+_GLOBAL_SEND_LIMIT = 25  # per second, with headroom under the 30/s cap
+_CHAT_SEND_INTERVAL = 1.0  # seconds between messages to one chat
+_CHAT_MINUTE_LIMIT = 19  # per chat per minute, under the 20/min group cap
+_send_window: deque = deque()  # monotonic timestamps of recent sends
+_chat_last_send: Dict[int, float] = {}
+_chat_minute_windows: Dict[int, deque] = defaultdict(deque)
+_send_limiter_lock = asyncio.Lock()
+
+
+async def _acquire_send_slot(chat_id: int) -> None:
+    while True:
+        async with _send_limiter_lock:
+            now = time.monotonic()
+            while _send_window and now - _send_window[0] >= 1.0:
+                _send_window.popleft()
+            chat_window = _chat_minute_windows[chat_id]
+            while chat_window and now - chat_window[0] >= 60.0:
+                chat_window.popleft()
+            if (
+                len(_send_window) < _GLOBAL_SEND_LIMIT
+                and len(chat_window) < _CHAT_MINUTE_LIMIT
+                and now - _chat_last_send.get(chat_id, 0.0) >= _CHAT_SEND_INTERVAL
+            ):
+                _send_window.append(now)
+                chat_window.append(now)
+                _chat_last_send[chat_id] = now
+                return
+        await asyncio.sleep(0.05)
+
+
 async def _send_safe(bot, chat_id: int, text: str, *, markdown: bool = True, disable_web_page_preview: bool = True) -> None:
+    await _acquire_send_slot(chat_id)
     try:
         if markdown:
             await bot.send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=disable_web_page_preview)
@@ -66,81 +122,104 @@ async def _send_safe(bot, chat_id: int, text: str, *, markdown: bool = True, dis
             logger.error(f"send_message failed (plain): {e2}")
 
 
+# The bulk of /start and /help never changes; build those parts once at import
+# and only interpolate the handful of per-chat values on each invocation.
+_START_STATIC_HEADER = (
+    "🤖 *Welcome to Polymarket NO Scanner Bot*\n\n"
+    "*Basic Commands:*\n"
+    "/start - Show this welcome message\n"
+    "/scan - Start automated scanning\n"
+    "/status - Show current status and settings\n"
+    "/stop - Stop scanning\n"
+    "/help - Show detailed help\n\n"
+    "*Settings Commands:*\n"
+    "/settings - View your current settings\n"
+    "/setprice <value> - Set price threshold (e.g., /setprice 0.01)\n"
+    "/setsize <int> - Set order size (e.g., /setsize 100)\n"
+    "/incsize <int> - Increase order size by amount (e.g., /incsize 10)\n"
+    "/setsell <value> - Set sell target price (e.g., /setsell 0.05)\n"
+    "/setauto on|off - Toggle auto-placing orders\n\n"
+    "*Order Management:*\n"
+    "/editorder <orderId> <price> [size] - Edit an order\n"
+    "/cancelorder <orderId> - Cancel an order\n\n"
+)
+
+_START_FOOTER_FMT = (
+    "*Your Current Settings:*\n"
+    "• Price Threshold: ${price}\n"
+    "• Order Size: {size}\n"
+    "• Sell Target: ${sell}\n"
+    "• Auto Place: {auto}\n"
+    "• Scan Interval: {interval}s"
+)
+
+
 async def start_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     chat_settings = get_settings_for_chat(chat_id)
     cfg = load_config()
-    
-    msg = (
-        "🤖 *Welcome to Polymarket NO Scanner Bot*\n\n"
-        "*Basic Commands:*\n"
-        "/start - Show this welcome message\n"
-        "/scan - Start automated scanning\n"
-        "/status - Show current status and settings\n"
-        "/stop - Stop scanning\n"
-        "/help - Show detailed help\n\n"
-        "*Settings Commands:*\n"
-        "/settings - View your current settings\n"
-        "/setprice <value> - Set price threshold (e.g., /setprice 0.01)\n"
-        "/setsize <int> - Set order size (e.g., /setsize 100)\n"
-        "/incsize <int> - Increase order size by amount (e.g., /incsize 10)\n"
-        "/setsell <value> - Set sell target price (e.g., /setsell 0.05)\n"
-        "/setauto on|off - Toggle auto-placing orders\n\n"
-        "*Order Management:*\n"
-        "/editorder <orderId> <price> [size] - Edit an order\n"
-        "/cancelorder <orderId> - Cancel an order\n\n"
-        f"*Your Current Settings:*\n"
-        f"• Price Threshold: ${chat_settings.get('maxPriceNoTokens')}\n"
-        f"• Order Size: {chat_settings.get('maxOrderSize')}\n"
-        f"• Sell Target: ${chat_settings.get('sellTargetPrice')}\n"
-        f"• Auto Place: {'On' if chat_settings.get('autoPlaceOrders') else 'Off'}\n"
-        f"• Scan Interval: {cfg.scan_interval_seconds}s"
+
+    msg = _START_STATIC_HEADER + _START_FOOTER_FMT.format(
+        price=chat_settings.get('maxPriceNoTokens'),
+        size=chat_settings.get('maxOrderSize'),
+        sell=chat_settings.get('sellTargetPrice'),
+        auto='On' if chat_settings.get('autoPlaceOrders') else 'Off',
+        interval=cfg.scan_interval_seconds,
     )
     await update.effective_message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
 
 
+_HELP_HEADER_FMT = (
+    "📖 *Bot Help Guide*\n\n"
+    "*How it Works:*\n"
+    "1. The bot scans Polymarket every {interval} seconds\n"
+    "2. It looks for NO tokens priced ≤ ${price}\n"
+    "3. When opportunities are found, you receive notifications\n"
+    "4. If auto-place is enabled, orders are automatically placed\n\n"
+)
+
+_HELP_STATIC_BODY = (
+    "*Basic Commands:*\n"
+    "/start - Initialize bot and show welcome\n"
+    "/scan - Start automated scanning for opportunities\n"
+    "/status - View bot status, statistics, and your settings\n"
+    "/stop - Stop the automated scanner\n"
+    "/help - Show this help message\n\n"
+    "*Settings Commands:*\n"
+    "/settings - View your personalized settings\n"
+    "/setprice <value> - Set buy threshold price\n"
+    "  Example: /setprice 0.008\n\n"
+    "/setsize <int> - Set default order size in shares\n"
+    "  Example: /setsize 150\n\n"
+    "/incsize <int> - Increase order size by amount\n"
+    "  Example: /incsize 20 (adds 20 to current size)\n\n"
+    "/setsell <value> - Set target price for selling\n"
+    "  Example: /setsell 0.05 (will try to sell at $0.05)\n\n"
+    "/setauto on|off - Enable/disable automatic order placement\n"
+    "  Example: /setauto on\n\n"
+    "*Order Management:*\n"
+    "/editorder <orderId> <price> [size] - Edit existing order\n"
+    "  Example: /editorder abc123 0.02 200\n\n"
+    "/cancelorder <orderId> - Cancel an active order\n"
+    "  Example: /cancelorder abc123\n\n"
+    "*Important Notes:*\n"
+    "• Settings are saved per chat and persist after restart\n"
+    "• Each chat can have different settings\n"
+    "• Only authorized chats can use this bot\n"
+    "• Orders require valid API credentials\n"
+    "• Always test with small amounts first"
+)
+
+
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     chat_settings = get_settings_for_chat(chat_id)
     cfg = load_config()
-    
-    msg = (
-        "📖 *Bot Help Guide*\n\n"
-        "*How it Works:*\n"
-        "1. The bot scans Polymarket every " + str(cfg.scan_interval_seconds) + " seconds\n"
-        "2. It looks for NO tokens priced ≤ $" + str(chat_settings.get('maxPriceNoTokens')) + "\n"
-        "3. When opportunities are found, you receive notifications\n"
-        "4. If auto-place is enabled, orders are automatically placed\n\n"
-        "*Basic Commands:*\n"
-        "/start - Initialize bot and show welcome\n"
-        "/scan - Start automated scanning for opportunities\n"
-        "/status - View bot status, statistics, and your settings\n"
-        "/stop - Stop the automated scanner\n"
-        "/help - Show this help message\n\n"
-        "*Settings Commands:*\n"
-        "/settings - View your personalized settings\n"
-        "/setprice <value> - Set buy threshold price\n"
-        "  Example: /setprice 0.008\n\n"
-        "/setsize <int> - Set default order size in shares\n"
-        "  Example: /setsize 150\n\n"
-        "/incsize <int> - Increase order size by amount\n"
-        "  Example: /incsize 20 (adds 20 to current size)\n\n"
-        "/setsell <value> - Set target price for selling\n"
-        "  Example: /setsell 0.05 (will try to sell at $0.05)\n\n"
-        "/setauto on|off - Enable/disable automatic order placement\n"
-        "  Example: /setauto on\n\n"
-        "*Order Management:*\n"
-        "/editorder <orderId> <price> [size] - Edit existing order\n"
-        "  Example: /editorder abc123 0.02 200\n\n"
-        "/cancelorder <orderId> - Cancel an active order\n"
-        "  Example: /cancelorder abc123\n\n"
-        "*Important Notes:*\n"
-        "• Settings are saved per chat and persist after restart\n"
-        "• Each chat can have different settings\n"
-        "• Only authorized chats can use this bot\n"
-        "• Orders require valid API credentials\n"
-        "• Always test with small amounts first"
-    )
+
+    msg = _HELP_HEADER_FMT.format(
+        interval=cfg.scan_interval_seconds,
+        price=chat_settings.get('maxPriceNoTokens'),
+    ) + _HELP_STATIC_BODY
     await update.effective_message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
 
 
@@ -168,6 +247,134 @@ async def status_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     await update.effective_message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
 
 
+# Market metadata (min order size etc.) rarely changes, yet _scan_once hits
+# get_market once per market per cycle. A short TTL cache removes nearly all
+# of those blocking HTTP calls on repeat scans.
+_market_cache: Dict[str, tuple] = {}  # cid -> (expires_at, market dict)
+_MARKET_TTL = 300.0
+
+
+def _get_market_cached(cid: str) -> Any:
+    now = time.monotonic()
+    cached = _market_cache.get(cid)
+    if cached and cached[0] > now:
+        return cached[1]
+    mk = get_market(cid)
+    _market_cache[cid] = (now + _MARKET_TTL, mk)
+    return mk
+
+
+# Possible keys that may carry a market's minimum order size
+_MIN_SIZE_KEYS = ('minOrderSize', 'min_order_size', 'min_size', 'lotSize', 'lot_size', 'minSizePerOrder')
+
+
+async def _prefetch_min_sizes(cids: set) -> Dict[str, int]:
+    """Fetch market metadata for all condition ids in one gather batch and
+    map each to its minimum order size, so the per-market order tasks become
+    pure submit calls with no blocking lookups of their own."""
+    cid_list = list(cids)
+    mkts = await asyncio.gather(
+        *(asyncio.to_thread(_get_market_cached, c) for c in cid_list),
+        return_exceptions=True,
+    )
+    min_sizes: Dict[str, int] = {}
+    for cid, mk in zip(cid_list, mkts):
+        if isinstance(mk, BaseException) or not isinstance(mk, dict):
+            continue
+        for k in _MIN_SIZE_KEYS:
+            v = mk.get(k)
+            if isinstance(v, (int, float)) and v > 0:
+                min_sizes[cid] = int(v) if v >= 1 else 1
+                break
+    return min_sizes
+
+
+async def _place_market_order(market: Dict[str, Any], max_price: float, max_order_size: int, min_sizes: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    """Size and submit the auto-order for one eligible market."""
+    # max_price is already a float from _scan_once; clamp with one comparison
+    # instead of a float()+min() pair per market
+    no_price = market.get('noPrice')
+    if no_price is None:
+        price = max_price
+    else:
+        no_price = float(no_price)
+        price = no_price if no_price < max_price else max_price
+    # Pass through even if token_id missing; resolver handles it downstream
+    op = {
+        'token_id': market.get('noTokenId'),
+        'price': price,
+        'market_question': market.get('question'),
+        'marketId': market.get('marketId') or market.get('condition_id'),
+        'slug': market.get('slug'),
+        'eventSlug': market.get('eventSlug'),
+    }
+
+    # Dynamic per-market size: clamp to the market minimum prefetched above
+    condition_id = op.get('marketId')
+    min_size = min_sizes.get(str(condition_id), 5) if condition_id else 5
+
+    # User preference from settings: max_order_size
+    desired_size = int(max_order_size) if isinstance(max_order_size, (int, float)) else 1
+    final_size = desired_size if desired_size >= min_size else min_size
+
+    results = await place_buy_orders([op], final_size, max_price)
+    return results[0] if results else None
+
+
+def _format_scan_summary(eligible_markets: List[Dict[str, Any]], max_price: float) -> str:
+    """Pure-CPU opportunities message; run via to_thread on large scans."""
+    # Append + join keeps message construction O(N) instead of reallocating
+    # the string per line
+    parts = ["🔍 *Opportunities Found* (NO ≤ ${:.4f})\n".format(max_price)]
+    for m in eligible_markets[:10]:  # Limit to 10 for message size
+        question = m.get('question') or 'Unknown'
+        no_price = m.get('noPrice', 0)
+        market_id = m.get('marketId', 'N/A')
+        url = m.get('url', '')
+        parts.append(f"• *{question}*\n  NO @ ${no_price:.4f} (ID: `{market_id}`)")
+        if url:
+            parts.append(f"  [View Market]({url})")
+        parts.append("")
+
+    if len(eligible_markets) > 10:
+        parts.append(f"\n(+{len(eligible_markets) - 10} more opportunities)")
+
+    return "\n".join(parts)
+
+
+def _format_order_summary(successful_orders: List[Dict[str, Any]], failed_orders: List[Dict[str, Any]], placed_details: List[Dict[str, Any]]) -> str:
+    """Pure-CPU order summary message for _scan_once."""
+    summary_parts = ["📊 *Order Summary*\n"]
+    if successful_orders:
+        summary_parts.append(f"✅ *{len(successful_orders)} orders placed*")
+        # Show up to 5 order ids/prices
+        for info in placed_details[:5]:
+            oid = info.get('order_id') or 'n/a'
+            p = info.get('price')
+            tok = info.get('token_id') or 'n/a'
+            pstr = f"${p:.4f}" if isinstance(p, (int, float)) else str(p)
+            summary_parts.append(f"  • Order {oid} at {pstr}")
+        # Include raw response (truncated) of first order for debugging.
+        # Only serialize the interesting keys - pretty-printing the
+        # whole payload just to cut it at 900 chars wastes CPU.
+        raw = placed_details[0].get('raw') if placed_details else None
+        try:
+            if isinstance(raw, dict):
+                subset = {k: raw[k] for k in ('order_id', 'orderId', 'id', 'status', 'price', 'size', 'success', 'errorMsg') if k in raw}
+                raw_str = json.dumps(subset, default=str) if subset else repr(raw)
+            else:
+                raw_str = repr(raw)
+        except Exception:
+            raw_str = str(raw)
+        if raw_str:
+            if len(raw_str) > 900:
+                raw_str = raw_str[:900] + "..."
+            summary_parts.append("\nRaw response (truncated):\n" + raw_str)
+    if failed_orders:
+        summary_parts.append(f"❌ *{len(failed_orders)} orders failed*")
+    return "\n".join(summary_parts)
+
+
 async def _scan_once(chat_id: int, bot) -> None:
     cfg = load_config()
     
@@ -182,27 +389,28 @@ async def _scan_once(chat_id: int, bot) -> None:
         
         # Use find_eligible_markets which uses Gamma API
         eligible_markets = await find_eligible_markets(max_price)
-        
+
+        # Gamma can surface the same condition under multiple slugs; dedupe so
+        # we neither format nor order the same market twice
+        seen: set = set()
+        unique: List[Dict[str, Any]] = []
+        for m in eligible_markets:
+            k = m.get('marketId') or m.get('condition_id') or m.get('noTokenId')
+            if k:
+                if k in seen:
+                    continue
+                seen.add(k)
+            unique.append(m)
+        eligible_markets = unique
+
         state['last_found'] = eligible_markets
         
         if eligible_markets:
             logger.info(f"Found {len(eligible_markets)} eligible markets for chat {chat_id}")
             
-            # Format and send opportunities
-            opp_text = "🔍 *Opportunities Found* (NO ≤ ${:.4f})\n\n".format(max_price)
-            for m in eligible_markets[:10]:  # Limit to 10 for message size
-                question = m.get('question') or 'Unknown'
-                no_price = m.get('noPrice', 0)
-                market_id = m.get('marketId', 'N/A')
-                url = m.get('url', '')
-                opp_text += f"• *{question}*\n  NO @ ${no_price:.4f} (ID: `{market_id}`)\n"
-                if url:
-                    opp_text += f"  [View Market]({url})\n"
-                opp_text += "\n"
-            
-            if len(eligible_markets) > 10:
-                opp_text += f"\n(+{len(eligible_markets) - 10} more opportunities)"
-            
+            # Formatting is pure CPU; push it to a worker thread so Telegram
+            # updates keep processing while a large scan renders
+            opp_text = await asyncio.to_thread(_format_scan_summary, eligible_markets, max_price)
             await _send_safe(bot, chat_id, opp_text, markdown=True, disable_web_page_preview=True)
             
             # Auto-place orders if enabled
@@ -212,75 +420,34 @@ async def _scan_once(chat_id: int, bot) -> None:
                 failed_orders = []
                 placed_details: List[Dict[str, Any]] = []
                 
-                for market in eligible_markets:
-                    try:
-                        price = min(float(market.get('noPrice', max_price)), max_price)
-                        # Pass through even if token_id missing; resolver handles it downstream
-                        op = {
-                            'token_id': market.get('noTokenId'),
-                            'price': price,
-                            'market_question': market.get('question'),
-                            'marketId': market.get('marketId') or market.get('condition_id'),
-                            'slug': market.get('slug'),
-                            'eventSlug': market.get('eventSlug'),
-                        }
-
-                        # --- Dynamic per-market size: clamp to market minimum ---
-                        # Try to resolve condition/market id to fetch market details
-                        condition_id = op.get('marketId')
-                        min_size = 5
-                        try:
-                            if condition_id:
-                                mk = get_market(str(condition_id))
-                                # Probe several possible keys that may carry the minimum order size
-                                for k in (
-                                    'minOrderSize', 'min_order_size', 'min_size', 'lotSize', 'lot_size', 'minSizePerOrder'
-                                ):
-                                    v = mk.get(k) if isinstance(mk, dict) else None
-                                    if isinstance(v, (int, float)) and v > 0:
-                                        min_size = int(v) if v >= 1 else 1
-                                        break
-                        except Exception:
-                            min_size = 5
-
-                        # User preference from settings: max_order_size
-                        desired_size = int(max_order_size) if isinstance(max_order_size, (int, float)) else 1
-                        final_size = desired_size if desired_size >= min_size else min_size
-
-                        results = await place_buy_orders([op], final_size, max_price)
-                        if results and results[0].get('status') == 'submitted':
-                            successful_orders.append(market)
-                            placed_details.append(results[0])
-                        else:
-                            failed_orders.append(market)
-                    except Exception as order_error:
-                        logger.exception("Error placing order: %s", order_error)
+                # One upfront metadata batch, then each market's placement is
+                # independent network I/O run concurrently instead of
+                # serializing the round-trips
+                cids = {
+                    str(m.get('marketId') or m.get('condition_id'))
+                    for m in eligible_markets
+                    if m.get('marketId') or m.get('condition_id')
+                }
+                min_sizes = await _prefetch_min_sizes(cids)
+                results = await asyncio.gather(
+                    *(_place_market_order(m, max_price, max_order_size, min_sizes) for m in eligible_markets),
+                    return_exceptions=True,
+                )
+                for market, result in zip(eligible_markets, results):
+                    if isinstance(result, BaseException):
+                        logger.error("Error placing order: %s", result)
+                        failed_orders.append(market)
+                    elif result and result.get('status') == 'submitted':
+                        successful_orders.append(market)
+                        placed_details.append(result)
+                    else:
                         failed_orders.append(market)
                 
                 # Send order summary
                 if successful_orders or failed_orders:
-                    summary = "📊 *Order Summary*\n\n"
-                    if successful_orders:
-                        summary += f"✅ *{len(successful_orders)} orders placed*\n"
-                        # Show up to 5 order ids/prices
-                        for info in placed_details[:5]:
-                            oid = info.get('order_id') or 'n/a'
-                            p = info.get('price')
-                            tok = info.get('token_id') or 'n/a'
-                            pstr = f"${p:.4f}" if isinstance(p, (int, float)) else str(p)
-                            summary += f"  • Order {oid} at {pstr}\n"
-                        # Include raw response (truncated) of first order for debugging
-                        raw = placed_details[0].get('raw') if placed_details else None
-                        try:
-                            raw_str = json.dumps(raw, indent=2, default=str)
-                        except Exception:
-                            raw_str = str(raw)
-                        if raw_str:
-                            if len(raw_str) > 900:
-                                raw_str = raw_str[:900] + "..."
-                            summary += "\nRaw response (truncated):\n" + raw_str
-                    if failed_orders:
-                        summary += f"❌ *{len(failed_orders)} orders failed*\n"
+                    summary = await asyncio.to_thread(
+                        _format_order_summary, successful_orders, failed_orders, placed_details
+                    )
                     await _send_safe(bot, chat_id, summary, markdown=True)
         else:
             logger.debug(f"No eligible markets found for chat {chat_id}")
@@ -293,11 +460,18 @@ async def _scan_once(chat_id: int, bot) -> None:
             pass
 
 
-async def _scanner_loop(chat_id: int, bot) -> None:
+async def _scanner_loop(chat_id: int, bot, stop_event: asyncio.Event) -> None:
     try:
-        while scanning_tasks.get(chat_id) is not None:
+        interval = max(5, load_config().scan_interval_seconds)
+        while not stop_event.is_set():
             await _scan_once(chat_id, bot)
-            await asyncio.sleep(max(5, load_config().scan_interval_seconds))
+            # Sleep by waiting on the stop event so /stop wakes the loop
+            # immediately instead of after up to a full interval
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
     except asyncio.CancelledError:
         logger.info(f"Scanner loop cancelled for chat {chat_id}")
     except Exception as e:
@@ -306,18 +480,22 @@ async def _scanner_loop(chat_id: int, bot) -> None:
 
 async def scan_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
-    if chat_id in scanning_tasks:
-        await update.effective_message.reply_text("Already scanning.")
-        return
+    async with _scan_locks[chat_id]:
+        if chat_id in scanning_tasks:
+            await update.effective_message.reply_text("Already scanning.")
+            return
+        stop_event = asyncio.Event()
+        task = _spawn(_scanner_loop(chat_id, context.bot, stop_event))
+        scanning_tasks[chat_id] = (task, stop_event)
     await update.effective_message.reply_text("Started scanning.")
-    task = asyncio.create_task(_scanner_loop(chat_id, context.bot))
-    scanning_tasks[chat_id] = task
 
 
 async def stop_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
-    task = scanning_tasks.pop(chat_id, None)
-    if task:
+    entry = scanning_tasks.pop(chat_id, None)
+    if entry:
+        task, stop_event = entry
+        stop_event.set()
         task.cancel()
     await update.effective_message.reply_text("Stopped scanning.")
 
@@ -460,9 +638,6 @@ async def monitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     if not args:
         await update.effective_message.reply_text("Usage: /monitor <conditionId> [tokenId] [durationSeconds] [pollIntervalSeconds]")
         return
-    if chat_id in monitor_tasks:
-        await update.effective_message.reply_text("Monitor already running. Use /stopmonitor first.")
-        return
     condition_id = args[0]
     token_id = args[1] if len(args) >= 2 else None
     try:
@@ -471,18 +646,22 @@ async def monitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     except Exception:
         await update.effective_message.reply_text("Invalid duration/interval")
         return
-    await update.effective_message.reply_text("Started monitoring.")
-    task = asyncio.create_task(
-        monitor_trades_and_orders(
-            chat_id,
-            context.bot,
-            condition_id=condition_id,
-            token_id=token_id,
-            poll_interval_seconds=interval,
-            duration_seconds=duration,
+    async with _monitor_locks[chat_id]:
+        if chat_id in monitor_tasks:
+            await update.effective_message.reply_text("Monitor already running. Use /stopmonitor first.")
+            return
+        task = _spawn(
+            monitor_trades_and_orders(
+                chat_id,
+                context.bot,
+                condition_id=condition_id,
+                token_id=token_id,
+                poll_interval_seconds=interval,
+                duration_seconds=duration,
+            )
         )
-    )
-    monitor_tasks[chat_id] = task
+        monitor_tasks[chat_id] = task
+    await update.effective_message.reply_text("Started monitoring.")
 
 
 async def stop_monitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -493,6 +672,102 @@ async def stop_monitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await update.effective_message.reply_text("Stopped monitoring.")
 
 
+# Candidate field names per logical column, precompiled once instead of being
+# re-packed into *args tuples on every row of the render loops below
+_ORDER_ID_FIELDS = ("id", "ID", "order_id", "orderId", "orderID")
+_SIDE_FIELDS = ("side", "SIDE", "Side")
+_SIZE_FIELDS = ("size", "SIZE", "Size", "amount", "quantity")
+_PRICE_FIELDS = ("price", "PRICE", "Price", "px")
+_TOKEN_FIELDS = ("token_id", "tokenId", "tokenID", "TOKEN_ID")
+_TRADE_TOKEN_FIELDS = _TOKEN_FIELDS + ("TokenId", "asset_id", "assetId")
+_TS_FIELDS = ("timestamp", "ts", "TS", "Timestamp", "time", "created_at", "createdAt")
+_TRADE_ID_FIELDS = ("order_id", "orderId", "orderID", "ORDER_ID", "OrderId", "id", "ID")
+_MAKER_FIELDS = (
+    "maker_address", "makerAddress", "maker", "MAKER", "Maker",
+    "user", "userAddress", "owner", "ownerAddress",
+)
+
+
+# One C-level call extracts all four aggregation fields from SDK trade
+# objects; dict-shaped trades fall back to the generic _pick path.
+_TRADE_GET = operator.attrgetter("side", "size", "price", "token_id")
+
+
+class _Trd(NamedTuple):
+    """Slim trade record: the five fields myorders actually uses, extracted
+    once during the filter pass so later loops index a tuple instead of
+    re-probing SDK objects or dicts field by field."""
+
+    side: Any
+    size: Any
+    price: Any
+    tok: Any
+    ts: Any
+
+
+def _fmt_price(p: Any) -> str:
+    """Render a price as $X.XXXX, falling back to str() for junk values.
+
+    The isinstance fast path skips try/except setup entirely for the common
+    case where the API already returned a number.
+    """
+    if isinstance(p, (int, float)):
+        return f"${p:.4f}"
+    try:
+        return f"${float(p):.4f}"
+    except (TypeError, ValueError):
+        return str(p)
+
+
+def _pick(o: Any, *keys: str) -> Any:
+    """First non-None value among keys, resolving the object's dict view once
+    instead of a getattr-or-get pair per field."""
+    d = o if isinstance(o, dict) else getattr(o, "__dict__", None)
+    if d is not None:
+        for k in keys:
+            v = d.get(k)
+            if v is not None:
+                return v
+    for k in keys:
+        v = getattr(o, k, None)
+        if v is not None:
+            return v
+    return None
+
+
+def _get_field(obj: Any, names: tuple) -> Any:
+    """First non-None value among candidate field names; one shape check per
+    object rather than try/except per name."""
+    if isinstance(obj, dict):
+        for name in names:
+            val = obj.get(name)
+            if val is not None:
+                return val
+        return None
+    for name in names:
+        val = getattr(obj, name, None)
+        if val is not None:
+            return val
+    return None
+
+
+def _field_getter(obj: Any):
+    """Bind the right accessor (dict .get vs getattr) once per row, so loops
+    that extract several fields from the same object pay the isinstance check
+    a single time instead of once per field."""
+    if isinstance(obj, dict):
+        return obj.get
+    return lambda name, _o=obj: getattr(_o, name, None)
+
+
+def _first(get, names: tuple) -> Any:
+    for name in names:
+        val = get(name)
+        if val is not None:
+            return val
+    return None
+
+
 async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Usage: /orderslive [limit] [scope]
     scope: open|trades|all (default all)
@@ -510,7 +785,9 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     except Exception:
         pass
 
-    client = create_clob_client()
+    # Cached singleton after the first call, but that first build reads .env
+    # and derives API creds - keep it off the event loop
+    client = await asyncio.to_thread(create_clob_client)
     # Optional typed params
     TradeParams = None  # type: ignore[assignment]
     OpenOrderParams = None  # type: ignore[assignment]
@@ -528,64 +805,72 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             return None
 
     address = _safe_get_address()
+    # Lowercase our address once; the row loops then only lowercase the
+    # incoming field instead of both sides per comparison
+    addr_lc = address.lower() if address else None
 
     lines = []
     lines_md: list[str] = []
     
-    def _addr_eq(a: str | None, b: str | None) -> bool:
-        return bool(a) and bool(b) and str(a).lower() == str(b).lower()
-    
-    # Helper to extract field from object with multiple variations
-    def _get_field_extended(obj, *names):
-        """Try multiple field name variations"""
-        if isinstance(obj, dict):
-            for name in names:
-                if name in obj:
-                    val = obj[name]
-                    if val is not None:
-                        return val
-        else:
-            for name in names:
-                try:
-                    val = getattr(obj, name, None)
-                    if val is not None:
-                        return val
-                except Exception:
-                    continue
-        if isinstance(obj, dict):
-            for name in names:
-                val = obj.get(name)
-                if val is not None:
-                    return val
-        return None
-    
+    # Build both requests up front, then run the blocking SDK calls in worker
+    # threads concurrently: the handler no longer blocks the event loop for
+    # either round-trip, and scope=all costs max(open, trades) not their sum.
+    open_params = None
+    if scope in ("open", "all") and OpenOrderParams is not None and address:
+        try:
+            open_params = OpenOrderParams(address=address, limit=limit)  # type: ignore[call-arg]
+        except Exception:
+            try:
+                open_params = OpenOrderParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
+            except Exception:
+                open_params = None
+
+    trade_params = None
+    api_filtered = False
+    if scope in ("trades", "all") and TradeParams is not None:
+        try:
+            # Try to pass maker filter and limit if supported by this client version
+            trade_params = TradeParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
+            api_filtered = True
+        except Exception:
+            try:
+                trade_params = TradeParams(maker_address=address)  # type: ignore[call-arg]
+                api_filtered = True
+            except Exception:
+                trade_params = None
+
+    def _fetch_open():
+        return client.get_orders(open_params) if open_params is not None else client.get_orders()
+
+    def _fetch_trades():
+        return client.get_trades(trade_params) if trade_params is not None else client.get_trades()
+
+    fetches: Dict[str, Any] = {}
+    if scope in ("open", "all"):
+        fetches['open'] = asyncio.to_thread(_fetch_open)
+    if scope in ("trades", "all"):
+        fetches['trades'] = asyncio.to_thread(_fetch_trades)
+    fetched = dict(zip(fetches.keys(), await asyncio.gather(*fetches.values(), return_exceptions=True)))
+
     # Open orders (filter by address if available)
     if scope in ("open", "all"):
         try:
-            params = None
-            if OpenOrderParams is not None and address:
-                try:
-                    params = OpenOrderParams(address=address, limit=limit)  # type: ignore[call-arg]
-                except Exception:
-                    try:
-                        params = OpenOrderParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
-                    except Exception:
-                        params = None
-            open_orders = client.get_orders(params) if params is not None else client.get_orders()
+            open_orders = fetched['open']
+            if isinstance(open_orders, BaseException):
+                raise open_orders
             open_orders = list(open_orders) if not isinstance(open_orders, list) else open_orders
             total_before_filter = len(open_orders)
             
-            # Local filter: only our orders if address known
-            if address:
+            # Local filter: only needed when the API didn't already filter by
+            # address (mirrors api_filtered on the trades path)
+            api_filtered_open = open_params is not None
+            if address and not api_filtered_open:
                 filtered = []
                 for o in open_orders:
                     try:
                         # Try many field name variations
-                        maker = _get_field_extended(
-                            o, 'maker_address', 'makerAddress', 'maker', 'MAKER', 'Maker',
-                            'user', 'userAddress', 'owner', 'ownerAddress'
-                        )
-                        if _addr_eq(maker, address):
+                        maker = _get_field(o, _MAKER_FIELDS)
+                        if maker is not None and str(maker).lower() == addr_lc:
                             filtered.append(o)
                     except Exception:
                         continue
@@ -596,20 +881,23 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             lines_md.append(f"📂 *Open Orders* (showing {len(open_orders)} of {total_before_filter} total):")
             if total_before_filter > 0 and len(open_orders) == 0 and address:
                 lines_md.append(f"_Note: Found {total_before_filter} orders but none matched your address. Check field names._")
+            _logged = False
             for o in open_orders:
                 try:
-                    oid = _get_field_extended(o, "id", "ID", "order_id", "orderId", "orderID")
-                    side = _get_field_extended(o, "side", "SIDE", "Side")
-                    size = _get_field_extended(o, "size", "SIZE", "Size", "amount", "quantity")
-                    price = _get_field_extended(o, "price", "PRICE", "Price", "px")
-                    token_id = _get_field_extended(o, "token_id", "tokenId", "tokenID", "TOKEN_ID")
+                    get = _field_getter(o)
+                    oid = _first(get, _ORDER_ID_FIELDS)
+                    side = _first(get, _SIDE_FIELDS)
+                    size = _first(get, _SIZE_FIELDS)
+                    price = _first(get, _PRICE_FIELDS)
+                    token_id = _first(get, _TOKEN_FIELDS)
                     lines.append(f" • {side} {size} @ ${price} | token:{token_id} | id:{oid}")
-                    try:
-                        pstr = f"${float(price):.4f}"
-                    except Exception:
-                        pstr = str(price)
-                    lines_md.append(f"• *{side}* {size} @ {pstr}  token: `{token_id}`  id: `{oid}`")
+                    lines_md.append(f"• *{side}* {size} @ {_fmt_price(price)}  token: `{token_id}`  id: `{oid}`")
                 except Exception:
+                    # Log the stack once per invocation: a malformed response
+                    # would otherwise capture a full traceback for every row
+                    if not _logged:
+                        logger.exception("orders_live_cmd: open-order row parse failed")
+                        _logged = True
                     continue
         except Exception as e:
             lines.append(f"Open orders error: {e}")
@@ -619,22 +907,9 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Trades for our address (filter locally by maker/taker if server-side filter unsupported)
     if scope in ("trades", "all"):
         try:
-            api_filtered = False
-            if TradeParams is not None:
-                params = None
-                try:
-                    # Try to pass maker filter and limit if supported by this client version
-                    params = TradeParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
-                    api_filtered = True
-                except Exception:
-                    try:
-                        params = TradeParams(maker_address=address)  # type: ignore[call-arg]
-                        api_filtered = True
-                    except Exception:
-                        params = None
-                trades = client.get_trades(params) if params is not None else client.get_trades()
-            else:
-                trades = client.get_trades()
+            trades = fetched['trades']
+            if isinstance(trades, BaseException):
+                raise trades
             trades = list(trades)
             total_before_filter = len(trades)
             # If we used TradeParams with maker_address, trust the API completely
@@ -648,14 +923,13 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 for t in trades:
                     try:
                         # Try multiple field name variations (same as test script)
-                        maker = getattr(t, 'maker_address', None) or getattr(t, 'maker', None)
-                        if isinstance(t, dict):
-                            maker = maker or t.get('maker_address') or t.get('maker')
-                        taker = getattr(t, 'taker_address', None) or getattr(t, 'taker', None)
-                        if isinstance(t, dict):
-                            taker = taker or t.get('taker_address') or t.get('taker')
+                        get = _field_getter(t)
+                        maker = _first(get, _MAKER_FIELDS)
+                        taker = _first(get, ('taker_address', 'taker'))
                         # If we can't find maker/taker fields, include it anyway (might be pre-filtered by API)
-                        if _addr_eq(maker, address) or _addr_eq(taker, address):
+                        if (maker is not None and str(maker).lower() == addr_lc) or (
+                            taker is not None and str(taker).lower() == addr_lc
+                        ):
                             filtered.append(t)
                         elif maker is None and taker is None:
                             # If fields not found, include it (API might have pre-filtered)
@@ -674,21 +948,22 @@ async def orders_live_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 lines_md.append(f"\n📈 *Recent Trades* (showing {len(trades)} of {total_before_filter} total):")
             if total_before_filter > 0 and len(trades) == 0 and address and not api_filtered:
                 lines_md.append(f"_Note: Found {total_before_filter} trades but none matched your address. Check field names._")
+            _logged = False
             for t in trades:
                 try:
-                    side = _get_field_extended(t, "side", "SIDE", "Side")
-                    size = _get_field_extended(t, "size", "SIZE", "Size", "amount", "quantity")
-                    price = _get_field_extended(t, "price", "PRICE", "Price", "px")
-                    ts = _get_field_extended(t, "timestamp", "ts", "TS", "Timestamp", "time", "created_at", "createdAt")
-                    token_id = _get_field_extended(t, "token_id", "tokenId", "tokenID", "TOKEN_ID", "TokenId", "asset_id", "assetId")
-                    oid = _get_field_extended(t, "order_id", "orderId", "orderID", "ORDER_ID", "OrderId", "id", "ID")
+                    get = _field_getter(t)
+                    side = _first(get, _SIDE_FIELDS)
+                    size = _first(get, _SIZE_FIELDS)
+                    price = _first(get, _PRICE_FIELDS)
+                    ts = _first(get, _TS_FIELDS)
+                    token_id = _first(get, _TRADE_TOKEN_FIELDS)
+                    oid = _first(get, _TRADE_ID_FIELDS)
                     lines.append(f" • {side} {size} @ ${price} | token:{token_id} | id:{oid} | {ts}")
-                    try:
-                        pstr = f"${float(price):.4f}"
-                    except Exception:
-                        pstr = str(price)
-                    lines_md.append(f"• *{side}* {size} @ {pstr}  token: `{token_id}`  id: `{oid}`  {ts}")
+                    lines_md.append(f"• *{side}* {size} @ {_fmt_price(price)}  token: `{token_id}`  id: `{oid}`  {ts}")
                 except Exception:
+                    if not _logged:
+                        logger.exception("orders_live_cmd: trade row parse failed")
+                        _logged = True
                     continue
         except Exception as e:
             lines.append(f"Trades error: {e}")
@@ -713,7 +988,9 @@ async def whoami_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     chat_id = update.effective_chat.id
     try:
         import os
-        client = create_clob_client()
+        # Cached singleton after the first call, but that first build reads
+        # .env and derives API creds - keep it off the event loop
+        client = await asyncio.to_thread(create_clob_client)
         addr = None
         try:
             addr = client.get_address()
@@ -737,11 +1014,29 @@ async def whoami_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         await _send_safe(context.bot, chat_id, f"whoami error: {e}", markdown=False)
 
 
+# (chat_id, command) -> running task; repeat invocations piggyback on the
+# in-flight one instead of stacking duplicate SDK round-trips
+_INFLIGHT_CMDS: Dict[tuple, asyncio.Task] = {}
+
+
 async def myorders_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Usage: /myorders [limit]
     Shows your open orders and recently filled orders (buys and sells),
     so you can see what has succeeded (filled buys you could resell).
+
+    Single-flight per chat: a /myorders sent while the previous one is still
+    fetching awaits that same task (one reply) rather than starting another.
     """
+    key = (update.effective_chat.id, "myorders")
+    task = _INFLIGHT_CMDS.get(key)
+    if task is None or task.done():
+        task = _spawn(_myorders_impl(update, context))
+        _INFLIGHT_CMDS[key] = task
+        task.add_done_callback(lambda _t, _k=key: _INFLIGHT_CMDS.pop(_k, None))
+    await asyncio.shield(task)
+
+
+async def _myorders_impl(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     args = context.args
     limit = 20
@@ -751,7 +1046,9 @@ async def myorders_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     except Exception:
         pass
 
-    client = create_clob_client()
+    # Cached singleton after the first call, but that first build reads .env
+    # and derives API creds - keep it off the event loop
+    client = await asyncio.to_thread(create_clob_client)
     # Optional typed params
     TradeParams = None  # type: ignore[assignment]
     OpenOrderParams = None  # type: ignore[assignment]
@@ -771,21 +1068,49 @@ async def myorders_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     address = _get_addr()
 
     lines: list[str] = []
+
+    # Both reads are independent round-trips; build params first, then run the
+    # blocking SDK calls concurrently in worker threads (as /orderslive does)
+    trade_params = None
+    if TradeParams is not None:
+        try:
+            trade_params = TradeParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
+        except Exception:
+            try:
+                trade_params = TradeParams(maker_address=address)  # type: ignore[call-arg]
+            except Exception:
+                trade_params = None
+
+    def _fetch_open():
+        return client.get_orders(OpenOrderParams()) if OpenOrderParams is not None else client.get_orders()
+
+    def _fetch_trades():
+        return client.get_trades(trade_params) if trade_params is not None else client.get_trades()
+
+    open_result, trades_result = await asyncio.gather(
+        asyncio.to_thread(_fetch_open), asyncio.to_thread(_fetch_trades), return_exceptions=True
+    )
+
     # Open orders (placed but not filled)
     try:
-        if OpenOrderParams is not None:
-            open_orders = client.get_orders(OpenOrderParams())
-        else:
-            open_orders = client.get_orders()
-        open_list = list(open_orders)
-        lines.append(f"📂 Open Orders (showing {min(len(open_list), limit)} of {len(open_list)}):")
-        for o in open_list[-limit:]:
+        open_orders = open_result
+        if isinstance(open_orders, BaseException):
+            raise open_orders
+        # Stream the iterable into a bounded window instead of materializing
+        # the full list just to slice its tail
+        open_dq: deque = deque(maxlen=limit)
+        total_open = 0
+        for o in open_orders:
+            total_open += 1
+            open_dq.append(o)
+        lines.append(f"📂 Open Orders (showing {len(open_dq)} of {total_open}):")
+        for o in open_dq:
             try:
-                oid = getattr(o, "id", None) or o.get("id")
-                side = getattr(o, "side", None) or o.get("side")
-                size = getattr(o, "size", None) or o.get("size")
-                price = getattr(o, "price", None) or o.get("price")
-                token_id = getattr(o, "token_id", None) or o.get("token_id")
+                oid = _pick(o, "id")
+                side = _pick(o, "side")
+                size = _pick(o, "size")
+                price = _pick(o, "price")
+                token_id = _pick(o, "token_id")
                 lines.append(f" • {side} {size} @ ${price} | token:{token_id} | id:{oid}")
             except Exception:
                 continue
@@ -794,71 +1119,72 @@ async def myorders_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Filled orders (trades) for our address
     try:
-        if TradeParams is not None:
-            params = None
+        trades = trades_result
+        if isinstance(trades, BaseException):
+            raise trades
+        # Keep only our trades (maker/taker equals our address) and last N.
+        # Casefold our side once; per-trade comparisons then only convert the
+        # incoming field.
+        addr_lc = address.casefold() if address else None
+
+        def _addr_eq(other: str | None) -> bool:
+            return other is not None and str(other).casefold() == addr_lc
+
+        # Stream the API result straight into a bounded window: old matches
+        # fall off as new ones append, so memory stays O(limit) and the full
+        # trade history is never materialized as a list
+        my_trades: deque = deque(maxlen=limit)
+        total_trades = 0
+        for t in trades or ():
+            total_trades += 1
             try:
-                params = TradeParams(maker_address=address, limit=limit)  # type: ignore[call-arg]
-            except Exception:
-                try:
-                    params = TradeParams(maker_address=address)  # type: ignore[call-arg]
-                except Exception:
-                    params = None
-            trades = client.get_trades(params) if params is not None else client.get_trades()
-        else:
-            trades = client.get_trades()
-        trades = list(trades)
-        # Keep only our trades (maker/taker equals our address) and last N
-        def _addr_eq(a: str | None, b: str | None) -> bool:
-            return bool(a) and bool(b) and str(a).lower() == str(b).lower()
-
-        my_trades = []
-        for t in trades:
-            try:
-                maker = getattr(t, "maker_address", None) or getattr(t, "maker", None) or (t.get("maker_address") if isinstance(t, dict) else None)
-                taker = getattr(t, "taker_address", None) or getattr(t, "taker", None) or (t.get("taker_address") if isinstance(t, dict) else None)
-                if address is None or _addr_eq(maker, address) or _addr_eq(taker, address):
-                    my_trades.append(t)
+                maker = _pick(t, "maker_address", "maker")
+                taker = _pick(t, "taker_address", "taker")
+                if address is None or _addr_eq(maker) or _addr_eq(taker):
+                    try:
+                        side, size, price, tok = _TRADE_GET(t)
+                    except AttributeError:
+                        side = _pick(t, "side")
+                        size = _pick(t, "size")
+                        price = _pick(t, "price")
+                        tok = _pick(t, "token_id", "tokenId")
+                    my_trades.append(_Trd(side, size, price, tok, _pick(t, "timestamp", "ts")))
             except Exception:
                 continue
-        my_trades = my_trades[-limit:]
 
         lines.append("")
-        lines.append(f"✅ Filled Orders (showing {len(my_trades)}):")
-        for t in my_trades:
-            try:
-                side = getattr(t, "side", None) or t.get("side")
-                size = getattr(t, "size", None) or t.get("size")
-                price = getattr(t, "price", None) or t.get("price")
-                ts = getattr(t, "timestamp", None) or t.get("timestamp") or getattr(t, "ts", None) or t.get("ts")
-                token_id = getattr(t, "token_id", None) or t.get("token_id") or getattr(t, "tokenId", None) or t.get("tokenId")
-                lines.append(f" • {side} {size} @ ${price} | token:{token_id} | {ts}")
-            except Exception:
-                continue
+        lines.append(f"✅ Filled Orders (showing {len(my_trades)} of {total_trades}):")
 
-        # Optional: summarize filled BUYS (what you can sell)
+        # Single pass over the window: the _Trd records already hold every
+        # field, so this loop just unpacks a tuple per trade to feed both the
+        # display line and the position aggregates.
         try:
-            from collections import defaultdict
-            net_position = defaultdict(float)
-            avg_cost_numer = defaultdict(float)
-            for t in my_trades:
-                side = (getattr(t, "side", None) or t.get("side")).upper()  # type: ignore[union-attr]
-                size = float(getattr(t, "size", None) or t.get("size") or 0)
-                price = float(getattr(t, "price", None) or t.get("price") or 0)
-                tok = getattr(t, "token_id", None) or t.get("token_id") or getattr(t, "tokenId", None) or t.get("tokenId")
+            # Plain dicts with .get accumulation: no defaultdict insert-on-read,
+            # and SELL-only tokens never allocate an avg-cost entry
+            net_position: dict = {}
+            avg_cost_numer: dict = {}
+            for side, size, price, tok, ts in my_trades:
+                lines.append(f" • {side} {size} @ ${price} | token:{tok} | {ts}")
                 if not tok:
                     continue
-                if side == "BUY":
-                    net_position[tok] += size
-                    avg_cost_numer[tok] += size * price
-                elif side == "SELL":
-                    net_position[tok] -= size
+                try:
+                    side_u = str(side).upper()
+                    qty = float(size or 0)
+                    px = float(price or 0)
+                except (TypeError, ValueError):
+                    continue
+                if side_u == "BUY":
+                    net_position[tok] = net_position.get(tok, 0.0) + qty
+                    avg_cost_numer[tok] = avg_cost_numer.get(tok, 0.0) + qty * px
+                elif side_u == "SELL":
+                    net_position[tok] = net_position.get(tok, 0.0) - qty
             lines.append("")
             lines.append("💼 Positions (net from filled trades):")
             shown = 0
-            for tok, qty in list(net_position.items())[::-1]:
+            for tok, qty in reversed(net_position.items()):
                 if abs(qty) < 1e-9:
                     continue
-                avg_cost = (avg_cost_numer[tok] / net_position[tok]) if net_position[tok] > 0 else 0
+                avg_cost = (avg_cost_numer.get(tok, 0.0) / qty) if qty > 0 else 0
                 lines.append(f" • token:{tok} | qty:{qty} | avg cost:${avg_cost:.4f}")
                 shown += 1
                 if shown >= 20:
@@ -869,7 +1195,40 @@ async def myorders_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     except Exception as e:
         lines.append(f"Filled orders error: {e}")
 
-    await _send_safe(context.bot, chat_id, "\n".join(lines[-400:]), markdown=False)
+    # Bounded tail without copying the whole list first
+    await _send_safe(context.bot, chat_id, "\n".join(deque(lines, maxlen=400)), markdown=False)
+
+
+# Command name -> handler; registered as one CommandHandler in start_bot
+_CMDS = {
+    "start": start_cmd,
+    "help": help_cmd,
+    "status": status_cmd,
+    "scan": scan_cmd,
+    "stop": stop_cmd,
+    "settings": settings_cmd,
+    "setprice": set_price_cmd,
+    "setsize": set_size_cmd,
+    "incsize": inc_size_cmd,
+    "setsell": set_sell_cmd,
+    "setauto": set_auto_cmd,
+    "editorder": edit_order_cmd,
+    "cancelorder": cancel_order_cmd,
+    "monitor": monitor_cmd,
+    "stopmonitor": stop_monitor_cmd,
+    "orderslive": orders_live_cmd,
+    "liveorders": orders_live_cmd,
+    "whoami": whoami_cmd,
+    "myorders": myorders_cmd,
+}
+
+
+async def _dispatch_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    text = update.effective_message.text or ""
+    name = text.split()[0].lstrip("/").split("@")[0].lower() if text else ""
+    fn = _CMDS.get(name)
+    if fn is not None:
+        await fn(update, context)
 
 
 async def start_bot() -> None:
@@ -880,28 +1239,19 @@ async def start_bot() -> None:
         ApplicationBuilder()
         .token(cfg.telegram_bot_token)
         .concurrent_updates(True)
+        # Size the outbound pool for bursty scan notifications running
+        # alongside command replies, so send_message doesn't stall on
+        # "connection pool occupied"; long-polling gets its own connection.
+        .connection_pool_size(256)
+        .pool_timeout(30)
+        .get_updates_connection_pool_size(1)
+        .get_updates_pool_timeout(60)
         .build()
     )
 
-    app.add_handler(CommandHandler("start", start_cmd))
-    app.add_handler(CommandHandler("help", help_cmd))
-    app.add_handler(CommandHandler("status", status_cmd))
-    app.add_handler(CommandHandler("scan", scan_cmd))
-    app.add_handler(CommandHandler("stop", stop_cmd))
-    app.add_handler(CommandHandler("settings", settings_cmd))
-    app.add_handler(CommandHandler("setprice", set_price_cmd))
-    app.add_handler(CommandHandler("setsize", set_size_cmd))
-    app.add_handler(CommandHandler("incsize", inc_size_cmd))
-    app.add_handler(CommandHandler("setsell", set_sell_cmd))
-    app.add_handler(CommandHandler("setauto", set_auto_cmd))
-    app.add_handler(CommandHandler("editorder", edit_order_cmd))
-    app.add_handler(CommandHandler("cancelorder", cancel_order_cmd))
-    app.add_handler(CommandHandler("monitor", monitor_cmd))
-    app.add_handler(CommandHandler("stopmonitor", stop_monitor_cmd))
-    app.add_handler(CommandHandler("orderslive", orders_live_cmd))
-    app.add_handler(CommandHandler("liveorders", orders_live_cmd))
-    app.add_handler(CommandHandler("whoami", whoami_cmd))
-    app.add_handler(CommandHandler("myorders", myorders_cmd))
+    # Single CommandHandler + dict dispatch: one hash lookup per update
+    # instead of a linear scan over ~20 registered handlers
+    app.add_handler(CommandHandler(list(_CMDS.keys()), _dispatch_cmd))
 
     logger.info("Starting Telegram bot ...")
     await app.initialize()
@@ -1,16 +1,46 @@
+import asyncio
+import functools
+import itertools
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from src.config.env import load_config
 
+# Optional Rust JSON codec (same pattern as polymarket_service); stdlib json
+# otherwise. orjson works in bytes, so the file IO below is bytes-based.
+try:
+    import orjson  # type: ignore
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+except Exception:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
 
 # Use a relative path from polymarket_tgBot root
 _BASE_DIR = Path(__file__).resolve().parent.parent.parent
 SETTINGS_DIR = Path(os.getenv("SETTINGS_DIR", _BASE_DIR / "data"))
 SETTINGS_FILE = SETTINGS_DIR / "settings.json"
 
+# Settings are read on every command and every scan tick; keep them in memory
+# (loaded once from disk) so the fast path is a dict lookup, and push writes
+# to a worker thread so handlers never block on file IO.
+_cache: Optional[Dict[str, Any]] = None
+_cache_lock = threading.Lock()
+# Strong refs to in-flight persist tasks (the loop only holds weak ones)
+_PENDING: set = set()
+
 
 def _ensure_store() -> None:
     SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -21,57 +51,119 @@ def _ensure_store() -> None:
 def _read_all() -> Dict[str, Any]:
     _ensure_store()
     try:
-        raw = SETTINGS_FILE.read_text(encoding="utf-8")
-        return json.loads(raw or "{}")
+        raw = SETTINGS_FILE.read_bytes()
+        return _loads(raw or b"{}")
     except Exception:
         return {}
 
 
-def _write_all(obj: Dict[str, Any]) -> None:
-    _ensure_store()
-    SETTINGS_FILE.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+# Persist tasks run in worker threads, so two rapid updates could otherwise
+# write concurrently. The lock serializes writers, the per-write mkstemp name
+# stops them from clobbering one shared temp file, and the sequence numbers
+# make sure an older snapshot that got scheduled first can never overwrite a
+# newer one that already landed.
+_write_lock = threading.Lock()
+_persist_seq = itertools.count(1)
+_last_written_seq = 0
+
+
+def _write_all(obj: Dict[str, Any], seq: Optional[int] = None) -> None:
+    # Write-then-rename so a crash mid-write can't leave a torn settings file;
+    # compact separators keep the payload (and dump time) minimal
+    global _last_written_seq
+    with _write_lock:
+        if seq is not None and seq <= _last_written_seq:
+            return  # a newer snapshot already reached disk
+        _ensure_store()
+        fd, tmp = tempfile.mkstemp(dir=SETTINGS_DIR, suffix=".json.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_dumps(obj))
+            os.replace(tmp, SETTINGS_FILE)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        if seq is not None:
+            _last_written_seq = seq
+
+
+def _load_cache() -> Dict[str, Any]:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _read_all()
+    return _cache
+
+
+def _schedule_persist() -> None:
+    """Write the current cache to disk without blocking the caller.
+
+    Snapshots the mapping first so a concurrent update can't mutate it
+    mid-serialization; falls back to a synchronous write when no event
+    loop is running (scripts, tests).
+    """
+    snapshot = {k: dict(v) if isinstance(v, dict) else v for k, v in _load_cache().items()}
+    seq = next(_persist_seq)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_all(snapshot, seq)
+        return
+    task = loop.create_task(asyncio.to_thread(_write_all, snapshot, seq))
+    _PENDING.add(task)
+    task.add_done_callback(_PENDING.discard)
+
+
+# Defaults derive purely from the (cached, process-lifetime) config, so build
+# them once; _default_settings hands out fresh copies since callers store and
+# patch the result.
+@functools.lru_cache(maxsize=1)
+def _default_settings_items() -> tuple:
+    cfg = load_config()
+    return (
+        ("maxPriceNoTokens", cfg.max_price_no_tokens),
+        ("maxOrderSize", cfg.max_order_size),
+        ("sellTargetPrice", cfg.sell_target_price),
+        ("autoPlaceOrders", cfg.auto_order),
+    )
 
 
 def _default_settings() -> Dict[str, Any]:
-    cfg = load_config()
-    return {
-        "maxPriceNoTokens": cfg.max_price_no_tokens,
-        "maxOrderSize": cfg.max_order_size,
-        "sellTargetPrice": cfg.sell_target_price,
-        "autoPlaceOrders": cfg.auto_order,
-    }
+    return dict(_default_settings_items())
 
 
 def get_settings_for_chat(chat_id: int) -> Dict[str, Any]:
-    all_settings = _read_all()
+    all_settings = _load_cache()
     key = str(chat_id)
     existing = all_settings.get(key)
     if existing:
         return existing
     defaults = _default_settings()
     all_settings[key] = defaults
-    _write_all(all_settings)
+    _schedule_persist()
     return defaults
 
 
 def update_settings_for_chat(chat_id: int, patch: Dict[str, Any]) -> Dict[str, Any]:
-    all_settings = _read_all()
+    all_settings = _load_cache()
     key = str(chat_id)
     current = all_settings.get(key) or {}
     next_settings = {**_default_settings(), **current, **patch}
     all_settings[key] = next_settings
-    _write_all(all_settings)
+    _schedule_persist()
     return next_settings
 
 
 def increment_size_for_chat(chat_id: int, delta: int) -> Dict[str, Any]:
-    all_settings = _read_all()
+    all_settings = _load_cache()
     key = str(chat_id)
     current = all_settings.get(key) or _default_settings()
     size = max(1, int(current.get("maxOrderSize", 1)) + int(delta))
     next_settings = {**current, "maxOrderSize": size}
     all_settings[key] = next_settings
-    _write_all(all_settings)
+    _schedule_persist()
     return next_settings
-
-
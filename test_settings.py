@@ -1,49 +1,70 @@
 #!/usr/bin/env python
-"""Test script to verify settings persistence and market fetching"""
+"""Pytest suite verifying settings persistence and market fetching.
+
+Run with: pytest test_settings.py
+The market test hits the live Gamma API; it skips (rather than fails) when
+the API returns nothing, matching the old script's warning behaviour.
+"""
 import asyncio
+
+import pytest
+
+from src.utils import settings_store
 from src.utils.settings_store import get_settings_for_chat, update_settings_for_chat, increment_size_for_chat
 from src.services.polymarket_service import fetch_public_search_page
 
-# Test 1: Settings persistence
-print("Test 1: Settings persistence")
-chat_id = 999999
-s1 = update_settings_for_chat(chat_id, {
-    'autoPlaceOrders': True,
-    'sellTargetPrice': 0.05,
-    'maxPriceNoTokens': 0.008
-})
-print(f"Set: {s1}")
-
-s2 = get_settings_for_chat(chat_id)
-print(f"Retrieved: {s2}")
-assert s2['autoPlaceOrders'] == True, "Auto order not persisted"
-assert s2['sellTargetPrice'] == 0.05, "Sell target not persisted"
-assert s2['maxPriceNoTokens'] == 0.008, "Price not persisted"
-print("✓ Settings persistence works\n")
-
-# Test 2: Increment size
-print("Test 2: Increment size")
-s3 = increment_size_for_chat(chat_id, 10)
-print(f"Incremented: {s3}")
-assert s3['maxOrderSize'] == s2['maxOrderSize'] + 10, "Increment failed"
-print("✓ Increment works\n")
-
-# Test 3: Market fetching
-print("Test 3: Market fetching from Gamma API")
-async def test_markets():
-    result = await fetch_public_search_page(page=1, limit_per_type=10)
-    markets = result.get("markets", [])
-    has_more = result.get("has_more", False)
-    print(f"Fetched {len(markets)} markets, has_more={has_more}")
-    if markets:
-        print(f"Sample market keys: {list(markets[0].keys())[:5]}")
-    return len(markets) > 0
-
-markets_ok = asyncio.run(test_markets())
-if markets_ok:
-    print("✓ Market fetching works\n")
-else:
-    print("⚠ Market fetching returned no markets (may be API issue)\n")
-
-print("All tests passed!")
+CHAT_ID = 999999
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings_store(tmp_path, monkeypatch):
+    """Point the settings store at a throwaway file for every test.
+
+    Without this, each run would read and permanently rewrite the tracked
+    data/settings.json (the increment test alone grows maxOrderSize by 10
+    per run). Swapping the module paths and dropping the in-memory cache
+    keeps runs isolated and repeatable; monkeypatch restores everything on
+    teardown.
+    """
+    monkeypatch.setattr(settings_store, "SETTINGS_DIR", tmp_path)
+    monkeypatch.setattr(settings_store, "SETTINGS_FILE", tmp_path / "settings.json")
+    monkeypatch.setattr(settings_store, "_cache", None)
+
+
+@pytest.fixture()
+def stored_settings():
+    """Write a known settings patch for the test chat and hand it back."""
+    return update_settings_for_chat(CHAT_ID, {
+        'autoPlaceOrders': True,
+        'sellTargetPrice': 0.05,
+        'maxPriceNoTokens': 0.008,
+    })
+
+
+def test_settings_persistence(stored_settings):
+    retrieved = get_settings_for_chat(CHAT_ID)
+    assert retrieved['autoPlaceOrders'] is True, "Auto order not persisted"
+    assert retrieved['sellTargetPrice'] == 0.05, "Sell target not persisted"
+    assert retrieved['maxPriceNoTokens'] == 0.008, "Price not persisted"
+
+
+def test_increment_size(stored_settings):
+    before = get_settings_for_chat(CHAT_ID)['maxOrderSize']
+    after = increment_size_for_chat(CHAT_ID, 10)
+    assert after['maxOrderSize'] == before + 10, "Increment failed"
+
+
+# Session scope: one Gamma round-trip shared by every test that reads it,
+# instead of a fresh event loop + fetch per test
+@pytest.fixture(scope='session')
+def gamma_page():
+    return asyncio.run(fetch_public_search_page(page=1, limit_per_type=10))
+
 
+def test_market_fetch(gamma_page):
+    markets = gamma_page.get("markets", [])
+    assert isinstance(markets, list)
+    assert isinstance(gamma_page.get("has_more", False), bool)
+    if not markets:
+        pytest.skip("Gamma returned no markets (may be an API issue)")
+    assert markets[0].keys(), "Market rows should carry fields"